@@ -1,20 +1,8 @@
 """ molecular descriptor libraries
+
+(submodules are imported on first access, see `automol._lazy`)
 """
-from automol import par
-from automol import geom
-from automol import zmat
-from automol import vmat
-from automol import zmatrix
-from automol import vmatrix
-from automol import graph
-from automol import inchi
-from automol import inchi_key
-from automol import smiles
-from automol import formula
-from automol import mult
-from automol import intmol
-from automol import prop
-from automol import etrans
+from automol import _lazy
 
 
 __all__ = [
@@ -34,3 +22,9 @@ __all__ = [
     'prop',
     'etrans'
 ]
+
+__getattr__ = _lazy.package_getattr(__name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,52 @@
+""" deferred imports, so that `import automol` stays cheap
+
+Submodules and the third-party backends behind them (RDKit, Open Babel,
+x2z, networkx, ...) are only imported once something is looked up on them.
+"""
+import sys
+import importlib
+import importlib.util
+
+
+def module(name):
+    """ a module that is imported on first attribute access
+
+    If the module has already been imported, it is returned as is.
+
+    :param name: the full name of the module
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(
+            "No module named {!r}".format(name), name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    loader.exec_module(mod)
+
+    # bind it on the parent package, as a regular import would
+    parent_name, _, child_name = name.rpartition('.')
+    if parent_name:
+        setattr(sys.modules[parent_name], child_name, mod)
+    return mod
+
+
+def package_getattr(package_name):
+    """ a package `__getattr__` that imports submodules on demand
+
+    :param package_name: the full name of the package
+    """
+
+    def __getattr__(name):
+        full_name = package_name + '.' + name
+        if (name.startswith('__') or
+                importlib.util.find_spec(full_name) is None):
+            raise AttributeError("module {!r} has no attribute {!r}"
+                                 .format(package_name, name))
+        return importlib.import_module(full_name)
+
+    return __getattr__
@@ -3,9 +3,11 @@
 
 from automol.cart import vec
 from automol.cart import mat
+from automol.cart import cell
 
 
 __all__ = [
     'vec',
     'mat',
+    'cell',
 ]
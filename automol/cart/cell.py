@@ -0,0 +1,79 @@
+""" cell-list neighbor search
+"""
+import itertools
+import numpy
+
+# below this many points, checking every pair at once is faster than binning
+BRUTE_FORCE_MAX = 150
+
+# cell offsets covering each pair of neighboring cells exactly once
+HALF_OFFSETS = tuple(
+    off for off in itertools.product((-1, 0, 1), repeat=3) if off > (0, 0, 0))
+
+
+def neighbor_pairs(xyzs, cutoff):
+    """ find all pairs of points that are closer than a cutoff distance
+
+    The points are binned into cubic cells of side `cutoff`, so that each
+    point is only compared against those in its own and the adjacent cells.
+    The cost is linear in the number of points for systems of fixed density.
+
+    :param xyzs: the points, as an (n, 3) array
+    :param cutoff: the cutoff distance
+    :returns: arrays `(idxs1, idxs2, dists)` for the pairs within the cutoff,
+        with `idxs1 < idxs2`, sorted by `idxs1` and then `idxs2`
+    """
+    xyzs = numpy.reshape(numpy.asarray(xyzs, dtype=float), (-1, 3))
+    natms = len(xyzs)
+
+    if natms < 2 or not cutoff > 0.:
+        idxs1 = idxs2 = numpy.zeros((0,), dtype=numpy.intp)
+    elif natms <= BRUTE_FORCE_MAX:
+        idxs1, idxs2 = numpy.triu_indices(natms, 1)
+    else:
+        idxs1, idxs2 = _cell_candidate_pairs(xyzs, cutoff)
+
+    dxyzs = xyzs[idxs1] - xyzs[idxs2]
+    dists = numpy.sqrt(numpy.einsum('ij,ij->i', dxyzs, dxyzs))
+    keep = dists < cutoff
+    idxs1, idxs2, dists = idxs1[keep], idxs2[keep], dists[keep]
+
+    order = numpy.lexsort((idxs2, idxs1))
+    return idxs1[order], idxs2[order], dists[order]
+
+
+def _cell_candidate_pairs(xyzs, cutoff):
+    """ candidate pairs from the same or adjacent cells, with idx1 < idx2
+    """
+    cells = numpy.floor((xyzs - numpy.min(xyzs, axis=0)) / cutoff)
+    cells = cells.astype(numpy.int64)
+    cell_keys, cell_idxs = numpy.unique(cells, axis=0, return_inverse=True)
+    cell_idxs = numpy.ravel(cell_idxs)
+
+    # group the point indices by cell
+    order = numpy.argsort(cell_idxs, kind='stable')
+    bounds = numpy.cumsum(numpy.bincount(cell_idxs))
+    cell_dct = {
+        tuple(key): order[start:end] for key, start, end in
+        zip(cell_keys.tolist(), numpy.concatenate([[0], bounds[:-1]]),
+            bounds)}
+
+    idxs1_lst, idxs2_lst = [], []
+    for key, idxs in cell_dct.items():
+        # pairs within the cell
+        sub1, sub2 = numpy.triu_indices(len(idxs), 1)
+        idxs1_lst.append(idxs[sub1])
+        idxs2_lst.append(idxs[sub2])
+
+        # pairs with each neighboring cell
+        for off in HALF_OFFSETS:
+            nkey = (key[0] + off[0], key[1] + off[1], key[2] + off[2])
+            if nkey in cell_dct:
+                nidxs = cell_dct[nkey]
+                idxs1_lst.append(numpy.repeat(idxs, len(nidxs)))
+                idxs2_lst.append(numpy.tile(nidxs, len(idxs)))
+
+    idxs1 = numpy.concatenate(idxs1_lst)
+    idxs2 = numpy.concatenate(idxs2_lst)
+    idxs1, idxs2 = numpy.minimum(idxs1, idxs2), numpy.maximum(idxs1, idxs2)
+    return idxs1, idxs2
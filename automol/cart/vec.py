@@ -149,12 +149,50 @@ def dihedral_angle(xyz1, xyz2, xyz3, xyz4):
 def distance_matrix(xyzs):
     """ determine the distance matrix for a series of points
     """
-    dist_mat = tuple(tuple(distance(xyz1, xyz2) if idx1 != idx2 else 0.
-                           for idx2, xyz2 in enumerate(xyzs))
-                     for idx1, xyz1 in enumerate(xyzs))
+    dist_mat = tuple(map(tuple, pairwise_distances(xyzs, xyzs)))
     return dist_mat
 
 
+def pairwise_distances(xyzs1, xyzs2, block_size=None):
+    """ the matrix of distances from each point in `xyzs1` to each in `xyzs2`
+
+    :param block_size: if set, build the matrix `block_size` rows at a time
+        to bound the size of the intermediate difference arrays
+    :returns: an array of shape (len(xyzs1), len(xyzs2))
+    """
+    xyzs1 = _point_array(xyzs1)
+    xyzs2 = _point_array(xyzs2)
+    dist_mat = numpy.empty((len(xyzs1), len(xyzs2)))
+    for start, dist_blk in pairwise_distance_blocks(xyzs1, xyzs2,
+                                                    block_size=block_size):
+        dist_mat[start:start+len(dist_blk)] = dist_blk
+    return dist_mat
+
+
+def pairwise_distance_blocks(xyzs1, xyzs2, block_size=None):
+    """ iterate over row blocks of the pairwise distance matrix
+
+    Lets callers that only need a reduction (a minimum, or a threshold test
+    that can fail early) avoid building the whole matrix.
+
+    :returns: pairs `(start, dist_blk)`, where `dist_blk` holds the distances
+        from points `start:start+len(dist_blk)` of `xyzs1` to all of `xyzs2`
+    """
+    xyzs1 = _point_array(xyzs1)
+    xyzs2 = _point_array(xyzs2)
+    block_size = max(len(xyzs1), 1) if block_size is None else block_size
+    assert block_size > 0
+    for start in range(0, len(xyzs1), block_size):
+        dxyzs = xyzs1[start:start+block_size, numpy.newaxis, :] - xyzs2
+        yield start, numpy.sqrt(numpy.einsum('ijk,ijk->ij', dxyzs, dxyzs))
+
+
+def _point_array(xyzs):
+    """ a series of points as an (n, 3) float array
+    """
+    return numpy.reshape(numpy.asarray(xyzs, dtype=float), (-1, 3))
+
+
 # transformations
 def rotater(axis, angle, orig_xyz=None):
     """ a function to rotate vectors about an axis at a particular point
@@ -5,11 +5,20 @@ representation hierarchy:
     2. stereo: graph, InChI, SMILES
     3. connectivity: graph, InChI, SMILES
     4. composition: formula
+
+(submodules are imported on first access, see `automol._lazy`)
 """
-from automol.convert import geom
-from automol.convert import zmatrix
+from automol import _lazy
 
 __all__ = [
     'geom',
     'zmatrix',
+    'cache',
+    'store',
 ]
+
+__getattr__ = _lazy.package_getattr(__name__)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -37,11 +37,14 @@ def to_zmatrix(x2m):
     """
     zma_str = pyx2z.zmatrix_string(x2m)
 
-    syms, key_mat, name_mat, val_dct = ar.zmatrix.read(
-        zma_str,
-        mat_entry_sep_ptt=',',
-        mat_entry_start_ptt=',',
-        setv_sep_ptt=app.padded(app.one_of_these(['', app.NEWLINE])))
+    try:
+        syms, key_mat, name_mat, val_dct = _split_zmatrix_string(zma_str)
+    except ValueError:
+        syms, key_mat, name_mat, val_dct = ar.zmatrix.read(
+            zma_str,
+            mat_entry_sep_ptt=',',
+            mat_entry_start_ptt=',',
+            setv_sep_ptt=app.padded(app.one_of_these(['', app.NEWLINE])))
 
     zma = _zmatrix_from_data(
         syms, key_mat, name_mat, val_dct,
@@ -49,6 +52,41 @@ def to_zmatrix(x2m):
     return zma
 
 
+def _split_zmatrix_string(zma_str):
+    """ read the fixed x2z z-matrix layout by splitting lines
+
+    x2z only hands its z-matrix out as text, so this reads the rows
+    (`sym, key, name, ...`) and values (`name = val`) directly instead of
+    matching them with regexes.
+
+    :raises ValueError: if the string doesn't have the expected layout
+    """
+    syms, key_mat, name_mat, val_dct = [], [], [], {}
+    for line in zma_str.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if '=' in line:
+            name, val = line.split('=')
+            val_dct[name.strip()] = float(val)
+        elif val_dct:
+            raise ValueError("Row after the z-matrix values: {}".format(line))
+        else:
+            sym, *entries = map(str.strip, line.split(','))
+            keys = tuple(map(int, entries[0::2]))
+            names = tuple(entries[1::2])
+            if (len(keys) != len(names) or len(keys) != min(len(syms), 3)
+                    or not sym.isalpha()):
+                raise ValueError("Unexpected z-matrix row: {}".format(line))
+            syms.append(sym)
+            key_mat.append(keys + (None,) * (3 - len(keys)))
+            name_mat.append(names + (None,) * (3 - len(names)))
+
+    if not syms or set(val_dct) != set(sum(name_mat, ())) - {None}:
+        raise ValueError("Incomplete z-matrix string:\n{}".format(zma_str))
+    return tuple(syms), tuple(key_mat), tuple(name_mat), val_dct
+
+
 def zmatrix_torsion_coordinate_names(x2m):
     """ z-matrix torsion coordinate name from an x2z molecule object
     """
@@ -62,3 +100,68 @@ def zmatrix_atom_ordering(x2m):
     idx_dct = {geo_key: zma_key
                for zma_key, geo_key in enumerate(x2m.atom_ordering())}
     return idx_dct
+
+
+class Analysis():
+    """ x2z analysis of one geometry
+
+    The x2z molecule is built once, and each result is computed on first
+    access and then kept.
+    """
+
+    def __init__(self, geo, ts_bnds=()):
+        self.geo = geo
+        self.ts_bnds = ts_bnds
+        self._x2m = None
+        self._orient_mg = None
+        self._results = {}
+
+    @property
+    def molecule(self):
+        """ the x2z molecule object
+        """
+        if self._x2m is None:
+            self._x2m = from_geometry(self.geo, ts_bnds=self.ts_bnds)
+        return self._x2m
+
+    @property
+    def oriented_geometry(self):
+        """ the oriented x2z molecule object
+        """
+        if self._orient_mg is None:
+            self._orient_mg = to_oriented_geometry(self.geo)
+        return self._orient_mg
+
+    def _result(self, name, func):
+        if name not in self._results:
+            self._results[name] = func()
+        return self._results[name]
+
+    def zmatrix(self):
+        """ the z-matrix, as x2z gives it (no standard form)
+        """
+        return self._result('zmatrix', lambda: to_zmatrix(self.molecule))
+
+    def zmatrix_torsion_coordinate_names(self):
+        """ torsion coordinate names, as x2z gives them
+        """
+        return self._result(
+            'torsion_names',
+            lambda: tuple(zmatrix_torsion_coordinate_names(self.molecule)))
+
+    def zmatrix_atom_ordering(self):
+        """ the z-matrix position of each geometry atom
+        """
+        return self._result(
+            'atom_ordering', lambda: zmatrix_atom_ordering(self.molecule))
+
+    def symmetry_number(self):
+        """ the external symmetry number
+        """
+        return self._result('sym_num', self.oriented_geometry.sym_num)
+
+    def is_enantiomer(self):
+        """ is the molecule chiral?
+        """
+        return self._result(
+            'is_enantiomer', self.oriented_geometry.is_enantiomer)
@@ -1,5 +1,6 @@
 """ rdkit interface
 """
+import numpy
 from rdkit import RDLogger
 import rdkit.Chem as _rd_chem
 import rdkit.Chem.AllChem as _rd_all_chem
@@ -29,10 +30,12 @@ def to_geometry(rdm):
     return geo
 
 
-def to_conformers(rdm, nconfs):
+def to_conformers(rdm, nconfs, random_seed=-1):
     """ list of cartesian geometries for conformers
         from an rdkit molecule object
         currently not removing redundant conformers
+
+    :param random_seed: seed for the embedding (-1 leaves it unseeded)
     """
     rdm = _rd_chem.AddHs(rdm)
     atms = rdm.GetAtoms()
@@ -44,7 +47,8 @@ def to_conformers(rdm, nconfs):
         geos.append(
             automol.create.geom.from_data(syms, xyzs, angstrom=True))
     else:
-        cids = _rd_all_chem.EmbedMultipleConfs(rdm, numConfs=nconfs)
+        cids = _rd_all_chem.EmbedMultipleConfs(
+            rdm, numConfs=nconfs, randomSeed=random_seed)
         res = _rd_all_chem.MMFFOptimizeMoleculeConfs(rdm)
         energies = list(zip(*res))[1]
         for cid in cids:
@@ -112,6 +116,76 @@ def to_connectivity_graph(rdm):
     return gra
 
 
+# graph data
+BOND_TYPE_DCT = {
+    1: _rd_chem.BondType.SINGLE,
+    2: _rd_chem.BondType.DOUBLE,
+    3: _rd_chem.BondType.TRIPLE,
+}
+
+
+def from_data(atm_keys, bnd_keys, atm_syms, atm_bnd_vlcs, atm_rad_vlcs,
+              bnd_ords, atm_xyzs=None):
+    """ rdkit molecule object from data, built directly in memory
+
+    Takes the same arguments as `automol.convert._molfile.from_data` and
+    gives the same molecule that RDKit reads from its molfile, without
+    writing and parsing the text.
+
+    :returns: the molecule, and a dictionary mapping the (1-based) atom
+        numbers back onto the original keys
+    """
+    natms = len(atm_keys)
+    keys = sorted(atm_keys)
+    key_map = dict(zip(keys, range(natms)))
+
+    sym_dct = dict(zip(atm_keys, atm_syms))
+    vlc_dct = dict(zip(atm_keys, atm_bnd_vlcs))
+    rad_dct = dict(zip(atm_keys, atm_rad_vlcs))
+
+    rwm = _rd_chem.RWMol()
+    for key in keys:
+        rda = _rd_chem.Atom(sym_dct[key])
+        rda.SetNoImplicit(True)
+        rda.SetNumRadicalElectrons(int(rad_dct[key]))
+        rwm.AddAtom(rda)
+
+    bnd_vlcs = [0] * natms
+    for key, ord_ in zip(bnd_keys, bnd_ords):
+        idx1, idx2 = sorted(map(key_map.__getitem__, key))
+        rwm.AddBond(idx1, idx2, BOND_TYPE_DCT[ord_])
+        bnd_vlcs[idx1] += ord_
+        bnd_vlcs[idx2] += ord_
+
+    # the remaining valence, if any, goes to hydrogens
+    for key, idx in key_map.items():
+        nhyd = vlc_dct[key] - bnd_vlcs[idx]
+        rwm.GetAtomWithIdx(idx).SetNumExplicitHs(max(int(nhyd), 0))
+
+    # round like the molfile does, so that both perceive the same stereo
+    xyzs = (numpy.zeros((natms, 3)) if atm_xyzs is None else
+            numpy.round(numpy.array(
+                [dict(zip(atm_keys, atm_xyzs))[key] for key in keys],
+                dtype=float), 3))
+    conf = _rd_chem.Conformer(natms)
+    for idx, xyz in enumerate(xyzs.tolist()):
+        conf.SetAtomPosition(idx, xyz)
+    conf.Set3D(bool(numpy.any(xyzs[:, 2])) if natms else False)
+    rwm.AddConformer(conf, assignId=True)
+
+    rdm = rwm.GetMol()
+    _rd_chem.SanitizeMol(rdm)
+    if atm_xyzs is None:
+        for rdb in rdm.GetBonds():
+            if rdb.GetBondType() == _rd_chem.BondType.DOUBLE:
+                rdb.SetStereo(_rd_chem.BondStereo.STEREOANY)
+    elif conf.Is3D():
+        _rd_chem.AssignStereochemistryFrom3D(rdm)
+
+    key_map_inv = {idx + 1: key for key, idx in key_map.items()}
+    return rdm, key_map_inv
+
+
 # molfile
 def from_molfile(mfl):
     """ rdkit molecule object from a mol block string
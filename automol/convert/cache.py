@@ -0,0 +1,184 @@
+""" process-wide memoization of expensive conversions
+
+Conversions such as InChI => geometry go through RDKit and re-verify the
+result, which is slow, and the same species tend to be requested over and over
+again. Functions wrapped with `memoized` store their results in one shared,
+bounded LRU cache, keyed on the conversion name, a canonical key for the input
+object, and the remaining arguments.
+"""
+import inspect
+import threading
+import functools
+import collections
+
+MAX_SIZE = 4096
+
+_LOCK = threading.RLock()
+_CACHE = collections.OrderedDict()
+_STATS = collections.defaultdict(lambda: [0, 0])
+_STATE = {'enabled': True, 'max_size': MAX_SIZE}
+
+
+# canonical keys for the objects we convert
+def string_key(obj):
+    """ canonical key for a string identifier (InChI, SMILES, ...)
+    """
+    return str(obj)
+
+
+def geometry_key(geo):
+    """ canonical key for a geometry, in either tuple or compact form
+    """
+    return tuple((str(sym), tuple(map(float, xyz))) for sym, xyz in geo)
+
+
+def graph_key(gra):
+    """ canonical key for a molecular graph
+    """
+    atm_dct, bnd_dct = gra
+    atm_items = tuple(sorted(
+        (key, tuple(val)) for key, val in atm_dct.items()))
+    bnd_items = tuple(sorted(
+        (tuple(sorted(key)), tuple(val)) for key, val in bnd_dct.items()))
+    return (atm_items, bnd_items)
+
+
+def graph_copy(gra):
+    """ copy the dictionaries of a graph, so cached values aren't mutated
+    """
+    atm_dct, bnd_dct = gra
+    return (dict(atm_dct), dict(bnd_dct))
+
+
+# the decorator
+def memoized(name, key=string_key, copy=None, ignore=()):
+    """ memoize a conversion function in the process-wide cache
+
+    :param name: the name of the conversion, used for the statistics
+    :param key: returns a canonical, hashable key for the first argument
+    :param copy: applied to the cached value before it is handed out, for
+        conversions that return mutable objects
+    :param ignore: names of arguments that don't affect the result, such as
+        worker counts, and are left out of the key
+
+    The wrapped function gets two extra attributes: `peek(*args, **kwargs)`
+    returns the cached result without computing it (None on a miss), and
+    `prime(val, *args, **kwargs)` caches a result that is already known.
+    """
+
+    def _decorator(func):
+        sig = inspect.signature(func)
+
+        def _cache_key(args, kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            for arg_name in ignore:
+                bound.arguments.pop(arg_name, None)
+            obj, *rest = bound.args
+            return (name, key(obj), tuple(rest),
+                    tuple(sorted(bound.kwargs.items())))
+
+        def _peek(*args, **kwargs):
+            """ the cached value for these arguments, or None (no statistics
+            are recorded)
+            """
+            val = None
+            if _STATE['enabled']:
+                with _LOCK:
+                    val = _CACHE.get(_cache_key(args, kwargs))
+            return val if val is None or copy is None else copy(val)
+
+        def _prime(val, *args, **kwargs):
+            """ cache a value known to be the result for these arguments
+            """
+            if _STATE['enabled']:
+                _store(_cache_key(args, kwargs), val)
+
+        @functools.wraps(func)
+        def _memoized(*args, **kwargs):
+            if not _STATE['enabled']:
+                return func(*args, **kwargs)
+
+            cache_key = _cache_key(args, kwargs)
+            with _LOCK:
+                found = cache_key in _CACHE
+                if found:
+                    _CACHE.move_to_end(cache_key)
+                    val = _CACHE[cache_key]
+                _STATS[name][0 if found else 1] += 1
+
+            if not found:
+                val = func(*args, **kwargs)
+                _store(cache_key, val)
+
+            return val if copy is None else copy(val)
+
+        _memoized.peek = _peek
+        _memoized.prime = _prime
+        return _memoized
+
+    return _decorator
+
+
+def _store(cache_key, val):
+    """ store a value, evicting the least recently used ones past the limit
+    """
+    with _LOCK:
+        _CACHE[cache_key] = val
+        _CACHE.move_to_end(cache_key)
+        while len(_CACHE) > _STATE['max_size']:
+            _CACHE.popitem(last=False)
+
+
+# controls
+def enable():
+    """ turn the conversion cache on
+    """
+    _STATE['enabled'] = True
+
+
+def disable():
+    """ turn the conversion cache off (cached values are kept)
+    """
+    _STATE['enabled'] = False
+
+
+def is_enabled():
+    """ is the conversion cache on?
+    """
+    return _STATE['enabled']
+
+
+def clear():
+    """ empty the conversion cache and reset its statistics
+    """
+    with _LOCK:
+        _CACHE.clear()
+        _STATS.clear()
+
+
+def set_max_size(max_size):
+    """ set the maximum number of cached conversions
+    """
+    assert max_size >= 0
+    with _LOCK:
+        _STATE['max_size'] = max_size
+        while len(_CACHE) > max_size:
+            _CACHE.popitem(last=False)
+
+
+def size():
+    """ the number of cached conversions
+    """
+    return len(_CACHE)
+
+
+def statistics():
+    """ cache hits and misses, by conversion name
+
+    :returns: a dictionary mapping each conversion name onto `(hits, misses)`
+    """
+    with _LOCK:
+        stats = {name: tuple(hits_misses)
+                 for name, hits_misses in _STATS.items()}
+    return stats
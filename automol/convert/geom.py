@@ -1,18 +1,39 @@
 """ geometry conversions
 """
-import itertools
+import collections
 import numpy
+from automol import cart
 from automol import create
-from automol.convert import _pyx2z
+from automol import _lazy
 from automol.convert import _util
+from automol.convert import cache
+from automol.convert import store
 import automol.graph
 import automol.geom
 import automol.zmatrix
 import automol.convert.graph
 import automol.convert.inchi
+_pyx2z = _lazy.module('automol.convert._pyx2z')
+
+
+# geometry => x2z analysis
+def x2z_analysis(geo, ts_bnds=()):
+    """ geometry => x2z analysis object, shared by all callers
+
+    The z-matrix, torsion names, atom ordering and symmetry number are all
+    read off the same x2z molecule, which is built once per geometry.
+    """
+    ts_bnds = tuple(map(tuple, ts_bnds))
+    return _x2z_analysis(geo, ts_bnds=ts_bnds)
+
+
+@cache.memoized('x2z_analysis', key=cache.geometry_key)
+def _x2z_analysis(geo, ts_bnds=()):
+    return _pyx2z.Analysis(geo, ts_bnds=ts_bnds)
 
 
 # geometry => z-matrix
+@store.persistent('zmatrix', key=store.geometry_key)
 def zmatrix(geo, ts_bnds=()):
     """ geometry => z-matrix
     """
@@ -23,12 +44,12 @@ def zmatrix(geo, ts_bnds=()):
         val_dct = {}
         zma = create.zmatrix.from_data(syms, key_mat, name_mat, val_dct)
     else:
-        x2m = _pyx2z.from_geometry(geo, ts_bnds=ts_bnds)
-        zma = _pyx2z.to_zmatrix(x2m)
+        zma = x2z_analysis(geo, ts_bnds=ts_bnds).zmatrix()
     zma = automol.zmatrix.standard_form(zma)
     return zma
 
 
+@store.persistent('zmatrix_torsion_names', key=store.geometry_key)
 def zmatrix_torsion_coordinate_names(geo, ts_bnds=()):
     """ z-matrix torsional coordinate names
     """
@@ -36,15 +57,15 @@ def zmatrix_torsion_coordinate_names(geo, ts_bnds=()):
     if len(syms) == 1:
         names = ()
     else:
-        x2m = _pyx2z.from_geometry(geo, ts_bnds=ts_bnds)
-        names = _pyx2z.zmatrix_torsion_coordinate_names(x2m)
+        x2z = x2z_analysis(geo, ts_bnds=ts_bnds)
+        names = x2z.zmatrix_torsion_coordinate_names()
 
-        zma = _pyx2z.to_zmatrix(x2m)
-        name_dct = automol.zmatrix.standard_names(zma)
+        name_dct = automol.zmatrix.standard_names(x2z.zmatrix())
         names = tuple(map(name_dct.__getitem__, names))
     return names
 
 
+@store.persistent('zmatrix_atom_ordering', key=store.geometry_key)
 def zmatrix_atom_ordering(geo, ts_bnds=()):
     """ z-matrix atom ordering
     """
@@ -52,11 +73,23 @@ def zmatrix_atom_ordering(geo, ts_bnds=()):
     if len(syms) == 1:
         idxs = (0,)
     else:
-        x2m = _pyx2z.from_geometry(geo, ts_bnds=ts_bnds)
-        idxs = _pyx2z.zmatrix_atom_ordering(x2m)
+        idxs = dict(x2z_analysis(geo, ts_bnds=ts_bnds).zmatrix_atom_ordering())
     return idxs
 
 
+def external_symmetry_number(geo):
+    """ geometry => external symmetry number, from x2z
+
+    (without the enantiomer factor; see
+    `automol.geom.external_symmetry_factor`)
+    """
+    if automol.geom.is_atom(geo):
+        sym_num = 1
+    else:
+        sym_num = x2z_analysis(geo).symmetry_number()
+    return sym_num
+
+
 # geometry => graph
 def connectivity_graph(geo,
                        rqq_bond_max=3.45, rqh_bond_max=2.6, rhh_bond_max=1.9):
@@ -64,24 +97,179 @@ def connectivity_graph(geo,
     """
     syms = automol.geom.symbols(geo)
     xyzs = automol.geom.coordinates(geo)
+    idxs1, idxs2, dists = _candidate_pairs(
+        syms, xyzs, rqq_bond_max, rqh_bond_max)
+    bnd_keys = _bond_keys_from_pairs(
+        syms, idxs1, idxs2, dists,
+        rqq_bond_max=rqq_bond_max, rqh_bond_max=rqh_bond_max,
+        rhh_bond_max=rhh_bond_max)
 
-    def _are_bonded(idx_pair):
-        xyz1, xyz2 = map(xyzs.__getitem__, idx_pair)
-        sym1, sym2 = map(syms.__getitem__, idx_pair)
-        dist = numpy.linalg.norm(numpy.subtract(xyz1, xyz2))
-        return (False if 'X' in (sym1, sym2) else
-                (dist < rqh_bond_max) if 'H' in (sym1, sym2) else
-                (dist < rhh_bond_max) if (sym1 == 'H' and sym2 == 'H') else
-                (dist < rqq_bond_max))
-
-    idxs = range(len(xyzs))
     atm_sym_dct = dict(enumerate(syms))
-    bnd_keys = tuple(
-        map(frozenset, filter(_are_bonded, itertools.combinations(idxs, r=2))))
     gra = create.graph.from_data(atom_symbols=atm_sym_dct, bond_keys=bnd_keys)
     return gra
 
 
+def _candidate_pairs(syms, xyzs, rqq_bond_max, rqh_bond_max, skin=0.):
+    """ atom pairs within the longest bond cutoff that could apply to them
+
+    :param skin: extend the search radius by this much
+    :returns: arrays `(idxs1, idxs2, dists)`
+    """
+    heavy = [sym not in ('H', 'X') for sym in syms]
+    cutoff = (max(rqq_bond_max, rqh_bond_max) if sum(heavy) > 1 else
+              rqh_bond_max)
+    return cart.cell.neighbor_pairs(xyzs, cutoff + skin)
+
+
+def _bond_keys_from_pairs(syms, idxs1, idxs2, dists,
+                          rqq_bond_max, rqh_bond_max, rhh_bond_max):
+    """ select the bonded pairs, applying the element-pair cutoffs
+    """
+    cutoffs = _pair_cutoffs(syms, idxs1, idxs2, rqq_bond_max=rqq_bond_max,
+                            rqh_bond_max=rqh_bond_max,
+                            rhh_bond_max=rhh_bond_max)
+    bonded = dists < cutoffs
+    bnd_keys = tuple(map(frozenset, zip(idxs1[bonded].tolist(),
+                                        idxs2[bonded].tolist())))
+    return bnd_keys
+
+
+def _pair_cutoffs(syms, idxs1, idxs2, rqq_bond_max, rqh_bond_max,
+                  rhh_bond_max):
+    """ the bond cutoff for each atom pair (-inf for pairs with dummy atoms)
+
+    (The cutoffs are chosen in the same order as always, so H-H pairs fall
+    under the `rqh_bond_max` test before the `rhh_bond_max` one is reached.)
+    """
+    syms = numpy.array(syms, dtype=object)
+    is_h = syms == 'H'
+    is_x = syms == 'X'
+
+    any_h = is_h[idxs1] | is_h[idxs2]
+    all_h = is_h[idxs1] & is_h[idxs2]
+    cutoffs = numpy.where(any_h, rqh_bond_max,
+                          numpy.where(all_h, rhh_bond_max, rqq_bond_max))
+    cutoffs = numpy.where(is_x[idxs1] | is_x[idxs2], -numpy.inf, cutoffs)
+    return cutoffs
+
+
+# the candidate pairs of a `ConnectivityTracker`, with the reference state
+# they were built around
+_PairList = collections.namedtuple(
+    '_PairList', ('ref_xyzs', 'idxs1', 'idxs2', 'cutoffs', 'ref_bonded',
+                  'margins'))
+
+
+class ConnectivityTracker():
+    """ incremental bond perception along a trajectory
+
+    Candidate atom pairs are collected within the longest bond cutoff plus a
+    `skin` distance, and the list is reused until some atom has moved more
+    than half the skin since it was built. In between, a pair is only
+    re-measured once its atoms have moved far enough, in total, to carry it
+    across its cutoff, so most frames only touch the pairs that sit near the
+    cutoff shell.
+
+    The bonds found for each frame are identical to those from
+    `connectivity_graph` with the same cutoffs.
+    """
+
+    def __init__(self, geo, rqq_bond_max=3.45, rqh_bond_max=2.6,
+                 rhh_bond_max=1.9, skin=1.):
+        self.skin = skin
+        self.rebuild_count = 0
+        self._syms = automol.geom.symbols(geo)
+        self._bond_maxes = {'rqq_bond_max': rqq_bond_max,
+                            'rqh_bond_max': rqh_bond_max,
+                            'rhh_bond_max': rhh_bond_max}
+        self._bnd_keys = frozenset()
+        self._pairs = None
+        self._bonded = None
+        self._build(_coordinate_array(geo))
+
+    @property
+    def bond_keys(self):
+        """ keys of the bonds in the current frame
+        """
+        return self._bnd_keys
+
+    def connectivity_graph(self):
+        """ the connectivity graph for the current frame
+        """
+        return create.graph.from_data(
+            atom_symbols=dict(enumerate(self._syms)),
+            bond_keys=self._bnd_keys)
+
+    def update(self, geo):
+        """ move on to the next frame
+
+        :returns: the bonds formed and broken since the previous frame, as a
+            transformation (see `automol.graph.trans.old_from_data`)
+        """
+        assert automol.geom.count(geo) == len(self._syms)
+        xyzs = _coordinate_array(geo)
+        pairs = self._pairs
+        disps = numpy.linalg.norm(xyzs - pairs.ref_xyzs, axis=1)
+
+        if len(disps) and numpy.max(disps) > self.skin / 2.:
+            old_bnd_keys = self._bnd_keys
+            self._build(xyzs)
+            frm_bnd_keys = self._bnd_keys - old_bnd_keys
+            brk_bnd_keys = old_bnd_keys - self._bnd_keys
+        else:
+            # only pairs whose atoms have moved past their margin can differ
+            # from how they were when the list was built
+            check = disps[pairs.idxs1] + disps[pairs.idxs2] >= pairs.margins
+            idxs1 = pairs.idxs1[check]
+            idxs2 = pairs.idxs2[check]
+            dxyzs = xyzs[idxs1] - xyzs[idxs2]
+            dists = numpy.sqrt(numpy.einsum('ij,ij->i', dxyzs, dxyzs))
+
+            bonded = numpy.array(pairs.ref_bonded)
+            bonded[check] = dists < pairs.cutoffs[check]
+            changed = numpy.flatnonzero(bonded != self._bonded)
+            self._bonded = bonded
+
+            chg_keys = list(map(frozenset, zip(
+                pairs.idxs1[changed].tolist(),
+                pairs.idxs2[changed].tolist())))
+            frm_bnd_keys = frozenset(
+                key for key, bnd in zip(chg_keys, bonded[changed]) if bnd)
+            brk_bnd_keys = frozenset(chg_keys) - frm_bnd_keys
+            self._bnd_keys = (self._bnd_keys | frm_bnd_keys) - brk_bnd_keys
+
+        return automol.graph.trans.old_from_data(frm_bnd_keys, brk_bnd_keys)
+
+    def _build(self, xyzs):
+        """ rebuild the candidate pair list around these coordinates
+        """
+        idxs1, idxs2, dists = _candidate_pairs(
+            self._syms, xyzs, self._bond_maxes['rqq_bond_max'],
+            self._bond_maxes['rqh_bond_max'], skin=self.skin)
+        cutoffs = _pair_cutoffs(self._syms, idxs1, idxs2, **self._bond_maxes)
+
+        ref_bonded = dists < cutoffs
+        self._pairs = _PairList(
+            ref_xyzs=numpy.array(xyzs), idxs1=idxs1, idxs2=idxs2,
+            cutoffs=cutoffs, ref_bonded=ref_bonded,
+            margins=numpy.abs(dists - cutoffs))
+        self._bonded = ref_bonded
+        self._bnd_keys = frozenset(map(frozenset, zip(
+            idxs1[ref_bonded].tolist(), idxs2[ref_bonded].tolist())))
+        self.rebuild_count += 1
+
+
+def _coordinate_array(geo):
+    """ geometry coordinates as an (n, 3) array
+    """
+    if isinstance(geo, create.geom.Geometry):
+        xyzs = geo.coordinates
+    else:
+        xyzs = numpy.reshape(
+            numpy.array(automol.geom.coordinates(geo), dtype=float), (-1, 3))
+    return xyzs
+
+
 def graph(geo, remove_stereo=False):
     """ geometry => graph
     """
@@ -92,6 +280,7 @@ def graph(geo, remove_stereo=False):
 
 
 # geometry => inchi
+@cache.memoized('geom_inchi', key=cache.geometry_key)
 def inchi(geo, remove_stereo=False):
     """ geometry => InChI
     """
@@ -7,11 +7,14 @@ import automol.graph
 import automol.inchi
 import automol.convert.inchi
 from automol.convert import _molfile
-from automol.convert import _rdkit
+from automol import _lazy
 from automol.convert import _util
+from automol.convert import cache
+_rdkit = _lazy.module('automol.convert._rdkit')
 
 
 # graph => inchi
+@cache.memoized('graph_inchi', key=cache.graph_key)
 def inchi(gra, remove_stereo=True):
     """ graph => inchi
     """
@@ -37,13 +40,18 @@ def _compare(gra1, gra2):
     return automol.graph.backbone_isomorphic(gra1, gra2)
 
 
-def inchi_with_sort_from_geometry(gra, geo=None, geo_idx_dct=None):
+def inchi_with_sort_from_geometry(gra, geo=None, geo_idx_dct=None,
+                                  molfile=False):
     """ connectivity graph => inchi conversion
 
     (if coordinates are passed in, they are used to determine stereo)
+
+    :param molfile: go through a V3000 molfile string, instead of building
+        the RDKit molecule directly (which falls back on this anyway if it
+        fails)
     """
     gra = automol.graph.without_dummy_atoms(gra)
-    gra = automol.graph.dominant_resonance(gra)
+    gra = automol.graph.kekule(gra)
     atm_keys = sorted(automol.graph.atom_keys(gra))
     bnd_keys = list(automol.graph.bond_keys(gra))
     atm_syms = dict_.values_by_key(automol.graph.atom_symbols(gra), atm_keys)
@@ -62,11 +70,20 @@ def inchi_with_sort_from_geometry(gra, geo=None, geo_idx_dct=None):
     else:
         atm_xyzs = None
 
-    mlf, key_map_inv = _molfile.from_data(
-        atm_keys, bnd_keys, atm_syms, atm_bnd_vlcs, atm_rad_vlcs, bnd_ords,
-        atm_xyzs=atm_xyzs)
-    rdm = _rdkit.from_molfile(mlf)
+    data = (atm_keys, bnd_keys, atm_syms, atm_bnd_vlcs, atm_rad_vlcs,
+            bnd_ords)
+    rdm = None
+    if not molfile:
+        try:
+            rdm, key_map_inv = _rdkit.from_data(*data, atm_xyzs=atm_xyzs)
+        except (KeyError, ValueError, RuntimeError):
+            rdm = None
+
+    if rdm is None:
+        mlf, key_map_inv = _molfile.from_data(*data, atm_xyzs=atm_xyzs)
+        rdm = _rdkit.from_molfile(mlf)
     ich, aux_info = _rdkit.to_inchi(rdm, with_aux_info=True)
+    automol.convert.inchi.recalculate.prime(ich, ich)
     nums = _parse_sort_order_from_aux_info(aux_info)
     nums = tuple(map(key_map_inv.__getitem__, nums))
     return ich, nums
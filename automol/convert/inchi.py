@@ -1,82 +1,197 @@
 """ inchi conversions
 """
+import os
+import time
 import functools
 import operator
+import multiprocessing
+import concurrent.futures
+from queue import Empty
 from qcelemental import constants as qcc
 from automol import error
 import automol.inchi
 import automol.geom
 import automol.graph
 import automol.convert.geom
-from automol.convert import _rdkit
-from automol.convert import _pybel
+from automol import _lazy
+from automol.convert import _util
+from automol.convert import cache
+from automol.convert import store
+_rdkit = _lazy.module('automol.convert._rdkit')
+_pybel = _lazy.module('automol.convert._pybel')
 
 
-def geometry(ich):
+@cache.memoized('inchi_geometry', ignore=('nprocs', 'timeout'))
+@store.persistent('geometry', ignore=('nprocs', 'timeout'))
+def geometry(ich, nprocs=1, timeout=None):
     """ InChI => geometry
+
+    :param nprocs: if greater than one, race the geometry generators against
+        each other in this many worker processes and take the first geometry
+        that passes the connectivity and stereo checks
+    :param timeout: in the racing mode, the number of seconds after which a
+        generator is given up on
     """
     # rdkit fails for multi-component inchis, so we split it up and space out
     # the geometries
     ichs = automol.inchi.split(ich)
-    geos = list(map(_connected_geometry, ichs))
+    geos = [_connected_geometry(ich, nprocs=nprocs, timeout=timeout)
+            for ich in ichs]
     geos = [automol.geom.translate(geo, [50. * idx, 0., 0.])
             for idx, geo in enumerate(geos)]
     geo = functools.reduce(automol.geom.join, geos)
     return geo
 
 
-def _connected_geometry(ich):
+def _connected_geometry(ich, nprocs=1, timeout=None):
     geo = object_from_hardcoded_inchi_by_key('geom', ich)
     if geo is None:
         ich = automol.inchi.standard_form(ich)
 
-        def _gen1(ich):
-            rdm = _rdkit.from_inchi(ich)
-            geo, = _rdkit.to_conformers(rdm, nconfs=1)
-            return geo
+        if nprocs > 1:
+            geo = _race_geometry_generators(ich, nprocs, timeout)
+        else:
+            for gen_, _ in GEOMETRY_GENERATORS:
+                geo = _checked_geometry(gen_, ich)
+                if geo is not None:
+                    break
 
-        def _gen2(ich):
-            pbm = _pybel.from_inchi(ich)
-            geo = _pybel.to_geometry(pbm)
-            return geo
+        if geo is None:
+            raise error.FailedGeometryGenerationError
 
-        def _gen3(ich):
-            if automol.inchi.has_stereo(ich):
-                raise ValueError
+    return geo
 
-            gra = automol.convert.inchi.graph(ich, no_stereo=True)
-            gra = automol.graph.explicit(gra)
-            geo, _ = automol.graph.heuristic_geometry(gra)
-            return geo
 
-        for gen_ in [_gen1, _gen1, _gen1, _gen2, _gen3]:
-            success = False
-            try:
-                geo = gen_(ich)
-                geo_ich = automol.convert.geom.inchi(geo)
-                # Check connectivity
-                same_conn = automol.inchi.same_connectivity(ich, geo_ich)
-                conn = automol.geom.connected(geo)
-                has_stereo = automol.inchi.has_stereo(ich)
-                ich_equiv = automol.inchi.equivalent(ich, geo_ich)
-                if (same_conn and conn) and (not has_stereo or ich_equiv):
-                    success = True
-                    break
-            except (RuntimeError, TypeError, ValueError):
-                continue
+def _rdkit_geometry(ich, random_seed=-1):
+    rdm = _rdkit.from_inchi(ich)
+    geo, = _rdkit.to_conformers(rdm, nconfs=1, random_seed=random_seed)
+    return geo
 
-        if not success:
-            raise error.FailedGeometryGenerationError
 
+def _pybel_geometry(ich):
+    pbm = _pybel.from_inchi(ich)
+    geo = _pybel.to_geometry(pbm)
     return geo
 
 
+def _heuristic_geometry(ich):
+    if automol.inchi.has_stereo(ich):
+        raise ValueError
+
+    gra = automol.convert.inchi.graph(ich, no_stereo=True)
+    gra = automol.graph.explicit(gra)
+    geo, _ = automol.graph.heuristic_geometry(gra)
+    return geo
+
+
+# geometry generators, in the order they are tried, with the keyword
+# arguments used when they are raced (in separate processes, the RDKit
+# attempts would otherwise all produce the same embedding)
+GEOMETRY_GENERATORS = (
+    (_rdkit_geometry, {'random_seed': 1}),
+    (_rdkit_geometry, {'random_seed': 2}),
+    (_rdkit_geometry, {'random_seed': 3}),
+    (_pybel_geometry, {}),
+    (_heuristic_geometry, {}),
+)
+
+
+def _checked_geometry(gen_, ich, gen_kwargs=None):
+    """ a geometry from this generator, if it passes the connectivity and
+    stereo checks (otherwise, None)
+    """
+    geo = None
+    try:
+        geo_ = gen_(ich, **(gen_kwargs or {}))
+        geo_ich = automol.convert.geom.inchi(geo_)
+        # Check connectivity
+        same_conn = automol.inchi.same_connectivity(ich, geo_ich)
+        conn = automol.geom.connected(geo_)
+        has_stereo = automol.inchi.has_stereo(ich)
+        ich_equiv = automol.inchi.equivalent(ich, geo_ich)
+        if (same_conn and conn) and (not has_stereo or ich_equiv):
+            geo = geo_
+    except (RuntimeError, TypeError, ValueError):
+        pass
+    return geo
+
+
+def _geometry_worker(queue, idx, gen_, ich, gen_kwargs):
+    queue.put((idx, _checked_geometry(gen_, ich, gen_kwargs=gen_kwargs)))
+
+
+def _race_geometry_generators(ich, nprocs, timeout=None, poll=0.05):
+    """ run the geometry generators concurrently, returning the first geometry
+    that passes the checks and terminating the others
+
+    A generator that runs longer than `timeout` seconds, or whose process
+    dies, counts as a failure.
+    """
+    queue = multiprocessing.Queue()
+    pending = list(enumerate(GEOMETRY_GENERATORS))
+    running = {}
+
+    geo = None
+    try:
+        while geo is None and (pending or running):
+            while pending and len(running) < nprocs:
+                idx, (gen_, gen_kwargs) = pending.pop(0)
+                proc = multiprocessing.Process(
+                    target=_geometry_worker,
+                    args=(queue, idx, gen_, ich, gen_kwargs), daemon=True)
+                proc.start()
+                running[idx] = (proc, time.monotonic())
+
+            for idx, geo_ in _drain(queue, timeout=poll):
+                # results from generators that were given up on are dropped
+                proc, _ = running.pop(idx, (None, None))
+                if proc is not None:
+                    proc.join()
+                    geo = geo_ if geo is None else geo
+
+            # the queue was just drained, so the workers stopped here are not
+            # in the middle of putting a result on it
+            now = time.monotonic()
+            for idx, (proc, start) in list(running.items()):
+                timed_out = timeout is not None and now - start > timeout
+                crashed = not proc.is_alive() and proc.exitcode != 0
+                if timed_out or crashed:
+                    proc.terminate()
+                    proc.join()
+                    running.pop(idx)
+    finally:
+        _drain(queue)
+        for proc, _ in running.values():
+            proc.terminate()
+            proc.join()
+        queue.close()
+
+    return geo
+
+
+def _drain(queue, timeout=None):
+    """ everything on the queue, waiting up to `timeout` seconds for the
+    first item
+    """
+    itms = []
+    try:
+        itms.append(queue.get(timeout=timeout) if timeout else
+                    queue.get_nowait())
+        while True:
+            itms.append(queue.get_nowait())
+    except Empty:
+        pass
+    return itms
+
+
 def conformers(ich, nconfs):
     """ InChI => conformers
     """
 
     geo = object_from_hardcoded_inchi_by_key('geom', ich)
-    if geo is None:
+    if geo is not None:
+        geos = [geo]
+    else:
         ich = automol.inchi.standard_form(ich)
 
         def _gen1(ich):
@@ -109,8 +224,88 @@ def conformers(ich, nconfs):
     return geos
 
 
+def batch_geometry(ichs, nprocs=None, chunksize=None):
+    """ InChIs => geometries, fanned out over a pool of worker processes
+
+    Results are yielded in input order, each as soon as it (and every one
+    before it) is done. A species whose geometry generation fails, for any
+    reason, gives None instead of stopping the batch.
+
+    :param ichs: the InChI strings
+    :param nprocs: the number of worker processes (by default, one per core;
+        with one, everything runs in this process)
+    :param chunksize: the number of InChIs handed to a worker at a time
+    :returns: `(geo, seconds)` for each InChI, where `seconds` is the time
+        spent on it
+    """
+    for ich, (geo, dur) in _batch(_timed_geometry, ichs, nprocs, chunksize):
+        if geo is not None:
+            geometry.prime(geo, ich)
+        yield geo, dur
+
+
+def batch_conformers(ichs, nconfs, nprocs=None, chunksize=None):
+    """ InChIs => conformers, fanned out over a pool of worker processes
+
+    Works like `batch_geometry`, yielding `(geos, seconds)` for each InChI.
+    """
+    ichs = list(ichs)
+    args_lst = zip(ichs, [nconfs] * len(ichs))
+    for _, ret in _batch(_timed_conformers, args_lst, nprocs, chunksize):
+        yield ret
+
+
+def _batch(func, args_lst, nprocs, chunksize):
+    """ map a function over arguments in a process pool, yielding each
+    argument with its result, in order
+    """
+    args_lst = list(args_lst)
+    nprocs = os.cpu_count() if nprocs is None else nprocs
+    if nprocs < 1:
+        raise ValueError('Need at least one process, not {}'.format(nprocs))
+    if chunksize is None:
+        chunksize = max(1, len(args_lst) // (4 * nprocs))
+
+    if nprocs == 1:
+        yield from zip(args_lst, map(func, args_lst))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(nprocs) as executor:
+            yield from zip(
+                args_lst, executor.map(func, args_lst, chunksize=chunksize))
+
+
+def _timed_geometry(ich):
+    start = time.perf_counter()
+    geo = _or_none(geometry, ich)
+    return geo, time.perf_counter() - start
+
+
+def _timed_conformers(args):
+    ich, nconfs = args
+    start = time.perf_counter()
+    geos = _or_none(conformers, ich, nconfs)
+    return geos, time.perf_counter() - start
+
+
+def _or_none(func, *args):
+    """ the result of a call, or None if it raises any error
+
+    (in a batch, one species that breaks a backend shouldn't take the
+    results for the others down with it)
+    """
+    try:
+        ret = func(*args)
+    except Exception:  # pylint: disable=broad-except
+        ret = None
+    return ret
+
+
+@cache.memoized('inchi_recalculate')
 def recalculate(ich, force_stereo=False):
     """ recalculate InChI string
+
+    (the result is a fixed point, so it is cached as its own recalculation;
+    this lets `automol.inchi.standard_form` recognize it without RDKit)
     """
     # for now, just assert that we have no multi-component strings with
     # hardcoded parts -- these are guaranteed to fail
@@ -131,9 +326,14 @@ def recalculate(ich, force_stereo=False):
         _options = '-SUU' if force_stereo else ''
         rdm = _rdkit.from_inchi(ich)
         ret = _rdkit.to_inchi(rdm, options=_options, with_aux_info=False)
+
+    if ret:
+        recalculate.prime(ret, ret, force_stereo=force_stereo)
     return ret
 
 
+@cache.memoized('inchi_graph', copy=cache.graph_copy)
+@store.persistent('graph')
 def graph(ich, no_stereo=False):
     """ inchi => graph
     """
@@ -165,6 +365,7 @@ def _connected_graph(ich, no_stereo=False):
     return gra
 
 
+@store.persistent('smiles')
 def smiles(ich):
     """ InChI => SMILEs
     """
@@ -184,6 +385,7 @@ def _connected_smiles(ich):
     return smi
 
 
+@store.persistent('inchi_key')
 def inchi_key(ich):
     """ InChI => InChIKey
     """
@@ -191,6 +393,7 @@ def inchi_key(ich):
     return ick
 
 
+@store.persistent('formula')
 def formula(ich):
     """ InChI => formula
     """
@@ -211,6 +414,7 @@ def _connected_formula(ich):
 
 
 # hardcoded inchis which neither RDKit nor Pybel can handle
+HARDCODED_INCHI_KEYS = ('inchi', 'geom', 'graph', 'smiles', 'formula')
 ANG2BOHR = qcc.conversion_factor('angstrom', 'bohr')
 HARDCODED_INCHI_DCT = {
     'InChI=1S/C': {
@@ -276,22 +480,108 @@ HARDCODED_INCHI_DCT = {
 }
 
 
+def add_hardcoded_inchi(ich, obj_dct):
+    """ add a hardcoded inchi, for species that neither RDKit nor Pybel can
+    handle
+
+    :param ich: the InChI string
+    :param obj_dct: the objects for this InChI, by key ('inchi', 'geom',
+        'graph', 'smiles', and 'formula')
+    """
+    assert set(obj_dct) == set(HARDCODED_INCHI_KEYS), (
+        'Hardcoded inchis need these objects: {}'.format(HARDCODED_INCHI_KEYS))
+    HARDCODED_INCHI_DCT[ich] = obj_dct
+    _invalidate_hardcoded_inchis()
+
+
+def remove_hardcoded_inchi(ich):
+    """ remove a hardcoded inchi
+    """
+    HARDCODED_INCHI_DCT.pop(ich)
+    _invalidate_hardcoded_inchis()
+
+
+def _invalidate_hardcoded_inchis():
+    """ drop everything that may have been computed from the old table: the
+    index, the conversion cache, and the species store
+    """
+    _HARDCODED_INCHI_IDX.clear()
+    cache.clear()
+    if store.is_connected():
+        store.clear()
+
+
 def object_from_hardcoded_inchi_by_key(key, ich):
     """ object from a hardcoded inchi by key
     """
     obj = None
-    for ich_, obj_dct in HARDCODED_INCHI_DCT.items():
+    bucket = _hardcoded_inchi_index()['inchi'].get(_inchi_bucket(ich), ())
+    for ich_ in bucket:
         if automol.inchi.equivalent(ich, ich_):
-            obj = obj_dct[key]
+            obj = HARDCODED_INCHI_DCT[ich_][key]
     return obj
 
 
 def object_to_hardcoded_inchi_by_key(key, obj, comp=operator.eq):
     """ object to hardcoded inchi by key
+
+    (geometries, graphs, and formulas are only compared against the entries
+    with the same formula)
     """
     ich = None
-    for ich_, obj_dct in HARDCODED_INCHI_DCT.items():
-        obj_ = obj_dct[key]
+    idx = _hardcoded_inchi_index()
+    if key in idx:
+        bucket = idx[key].get(_BUCKET_FUNC_DCT[key](obj), ())
+    else:
+        bucket = tuple(HARDCODED_INCHI_DCT)
+
+    for ich_ in bucket:
+        obj_ = HARDCODED_INCHI_DCT[ich_][key]
         if comp(obj, obj_):
             ich = ich_
     return ich
+
+
+# index of the hardcoded inchis, bucketed by (a key for) their formulas
+def _inchi_bucket(ich):
+    return automol.inchi.formula_sublayer(ich)
+
+
+def _formula_bucket(fml):
+    return tuple(sorted((sym, cnt) for sym, cnt in fml.items() if cnt))
+
+
+def _geometry_bucket(geo):
+    return _formula_bucket(_util.formula(automol.geom.symbols(geo)))
+
+
+def _graph_bucket(gra):
+    return _formula_bucket(automol.graph.formula(gra))
+
+
+_BUCKET_FUNC_DCT = {
+    'inchi': _inchi_bucket,
+    'geom': _geometry_bucket,
+    'graph': _graph_bucket,
+    'formula': _formula_bucket,
+}
+_HARDCODED_INCHI_IDX = {}
+
+
+def _hardcoded_inchi_index():
+    """ the index, built on first use (the inchi module isn't loaded yet when
+    this one is imported)
+    """
+    if not _HARDCODED_INCHI_IDX:
+        for key in _BUCKET_FUNC_DCT:
+            _HARDCODED_INCHI_IDX[key] = {}
+
+        for ich, obj_dct in HARDCODED_INCHI_DCT.items():
+            fml_bucket = _formula_bucket(obj_dct['formula'])
+            bucket_dct = {'inchi': _inchi_bucket(ich),
+                          'geom': fml_bucket, 'graph': fml_bucket,
+                          'formula': fml_bucket}
+            for key, bucket in bucket_dct.items():
+                idx_dct = _HARDCODED_INCHI_IDX[key]
+                idx_dct[bucket] = idx_dct.get(bucket, ()) + (ich,)
+    return _HARDCODED_INCHI_IDX
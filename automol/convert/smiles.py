@@ -1,7 +1,8 @@
 """ smiles conversions
 """
 import automol.convert.inchi
-from automol.convert import _rdkit
+from automol import _lazy
+_rdkit = _lazy.module('automol.convert._rdkit')
 
 
 def inchi(smi):
@@ -0,0 +1,179 @@
+""" persistent, on-disk store of species representations
+
+Conversions wrapped with `persistent` look their result up in an SQLite
+database before computing it, and save it there afterwards, so that
+embeddings and z-matrix builds survive between runs. Nothing is stored until
+a database is opened with `connect`.
+
+Every row is stamped with a version string. Rows with a different stamp are
+treated as missing and are overwritten, so bumping the version invalidates
+everything computed before.
+"""
+import os
+import pickle
+import sqlite3
+import hashlib
+import threading
+import functools
+import inspect
+from automol.convert import cache
+
+VERSION = '1'
+
+_LOCK = threading.RLock()
+_STATE = {'path': None, 'version': VERSION, 'conn': None, 'pid': None}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS species (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (kind, key)
+)
+"""
+
+
+# opening and closing the store
+def connect(path, version=VERSION):
+    """ open (or create) the species store at this path
+
+    :param path: the SQLite database file
+    :param version: the version stamp for entries; entries carrying any other
+        stamp are ignored and replaced
+    """
+    disconnect()
+    with _LOCK:
+        _STATE['path'] = os.path.abspath(path)
+        _STATE['version'] = str(version)
+        _connection()
+
+
+def disconnect():
+    """ close the species store; conversions stop consulting it
+    """
+    with _LOCK:
+        if _STATE['conn'] is not None and _STATE['pid'] == os.getpid():
+            _STATE['conn'].close()
+        _STATE.update({'path': None, 'conn': None, 'pid': None})
+
+
+def is_connected():
+    """ is a species store open?
+    """
+    return _STATE['path'] is not None
+
+
+def _connection():
+    """ the connection for this process, reopened after a fork
+    """
+    if _STATE['conn'] is None or _STATE['pid'] != os.getpid():
+        conn = sqlite3.connect(_STATE['path'], timeout=60.,
+                               check_same_thread=False)
+        conn.execute(_SCHEMA)
+        conn.commit()
+        _STATE['conn'] = conn
+        _STATE['pid'] = os.getpid()
+    return _STATE['conn']
+
+
+# reading and writing entries
+def get(kind, key):
+    """ the stored value for this kind of representation and key
+
+    :returns: the value, or None if it is missing or has a stale version
+    """
+    val = None
+    with _LOCK:
+        row = _connection().execute(
+            'SELECT version, value FROM species WHERE kind = ? AND key = ?',
+            (kind, key)).fetchone()
+    if row is not None and row[0] == _STATE['version']:
+        val = pickle.loads(row[1])
+    return val
+
+
+def put(kind, key, val):
+    """ store a value for this kind of representation and key
+    """
+    blob = pickle.dumps(val, protocol=pickle.HIGHEST_PROTOCOL)
+    with _LOCK:
+        conn = _connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO species (kind, key, version, value) '
+            'VALUES (?, ?, ?, ?)', (kind, key, _STATE['version'], blob))
+        conn.commit()
+
+
+def count():
+    """ the number of current (not stale) entries in the store
+    """
+    with _LOCK:
+        num, = _connection().execute(
+            'SELECT COUNT(*) FROM species WHERE version = ?',
+            (_STATE['version'],)).fetchone()
+    return num
+
+
+def purge():
+    """ delete the stale entries from the store
+    """
+    with _LOCK:
+        conn = _connection()
+        conn.execute('DELETE FROM species WHERE version != ?',
+                     (_STATE['version'],))
+        conn.commit()
+
+
+def clear():
+    """ delete every entry from the store
+    """
+    with _LOCK:
+        conn = _connection()
+        conn.execute('DELETE FROM species')
+        conn.commit()
+
+
+# keys for the objects we convert
+def geometry_key(geo):
+    """ stable key for a geometry, the same across processes
+    """
+    return hashlib.sha256(
+        repr(cache.geometry_key(geo)).encode()).hexdigest()
+
+
+# the decorator
+def persistent(kind, key=cache.string_key, ignore=()):
+    """ consult the species store before running a conversion
+
+    :param kind: the kind of representation returned by the conversion
+    :param key: returns a stable string key for the first argument
+    :param ignore: names of arguments that don't affect the result
+    """
+
+    def _decorator(func):
+        sig = inspect.signature(func)
+
+        @functools.wraps(func)
+        def _persistent(*args, **kwargs):
+            if not is_connected():
+                return func(*args, **kwargs)
+
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            for arg_name in ignore:
+                bound.arguments.pop(arg_name, None)
+            obj, *rest = bound.args
+            store_key = key(obj)
+            if rest or bound.kwargs:
+                store_key += repr((tuple(rest), sorted(bound.kwargs.items())))
+
+            val = get(kind, store_key)
+            if val is None:
+                val = func(*args, **kwargs)
+                put(kind, store_key, val)
+            return val
+
+        return _persistent
+
+    return _decorator
@@ -1,20 +1,205 @@
 """ geometry constructor
 """
+import sys
+import functools
 import numpy
 from qcelemental import periodictable as pt
 from qcelemental import constants as qcc
 
 
-def from_data(symbols, coordinates, angstrom=False):
+def from_data(symbols, coordinates, angstrom=False, as_array=False):
     """ geometry data structure from symbols and coordinates
+
+    :param as_array: return an array-backed `Geometry` instead of a tuple
     """
-    syms = list(map(pt.to_E, symbols))
+    syms = list(map(_element_symbol, symbols))
     natms = len(syms)
 
     xyzs = numpy.array(coordinates, dtype=float)
     assert numpy.ndim(xyzs) == 2 and numpy.shape(xyzs) == (natms, 3)
     xyzs = (xyzs if not angstrom else
             numpy.multiply(xyzs, qcc.conversion_factor('angstrom', 'bohr')))
-    xyzs = list(map(tuple, xyzs))
-    geo = tuple(zip(syms, xyzs))
+    if as_array:
+        geo = Geometry(syms, xyzs)
+    else:
+        xyzs = list(map(tuple, xyzs.tolist()))
+        geo = tuple(zip(syms, xyzs))
     return geo
+
+
+class Geometry():
+    """ compact, immutable geometry backed by an (n, 3) coordinate array
+
+    Iterates, indexes, hashes and compares exactly like the standard
+    tuple-of-pairs form `((sym, (x, y, z)), ...)`, so it can be passed to any
+    function that takes a geometry. The symbols are interned and the
+    coordinate and atomic number arrays are read-only, so the properties
+    below are zero-copy views of the underlying data.
+    """
+    __slots__ = ('_syms', '_nums', '_xyzs', '_hash')
+
+    def __init__(self, syms, xyzs):
+        syms, nums = _intern_symbols(syms)
+        xyzs = numpy.array(xyzs, dtype=numpy.float64, order='C')
+        if not syms:
+            xyzs = numpy.reshape(xyzs, (0, 3))
+        assert numpy.shape(xyzs) == (len(syms), 3)
+        xyzs.flags.writeable = False
+
+        self._syms = syms
+        self._nums = nums
+        self._xyzs = xyzs
+        self._hash = None
+
+    @property
+    def symbols(self):
+        """ atomic symbols, as a tuple of interned strings
+        """
+        return self._syms
+
+    @property
+    def numbers(self):
+        """ atomic numbers, as a read-only integer array
+        """
+        return self._nums
+
+    @property
+    def coordinates(self):
+        """ atomic coordinates, as a read-only (n, 3) array
+        """
+        return self._xyzs
+
+    def subset(self, idxs):
+        """ a new geometry from the atoms at these indices, in this order
+        """
+        idxs = numpy.fromiter(idxs, dtype=numpy.intp)
+        syms = tuple(map(self._syms.__getitem__, idxs))
+        return Geometry(syms, self._xyzs[idxs])
+
+    def __len__(self):
+        return len(self._syms)
+
+    def __iter__(self):
+        return zip(self._syms, map(tuple, self._xyzs.tolist()))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return Geometry(self._syms[idx], self._xyzs[idx])
+        return (self._syms[idx], tuple(self._xyzs[idx].tolist()))
+
+    def __eq__(self, other):
+        if isinstance(other, Geometry):
+            ret = (self._syms == other.symbols and
+                   numpy.array_equal(self._xyzs, other.coordinates))
+        elif isinstance(other, tuple):
+            ret = tuple(self) == other
+        else:
+            ret = NotImplemented
+        return ret
+
+    def __ne__(self, other):
+        ret = self.__eq__(other)
+        return ret if ret is NotImplemented else not ret
+
+    def __hash__(self):
+        # must agree with the hash of the equivalent tuple-of-pairs
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __add__(self, other):
+        if isinstance(other, Geometry):
+            ret = Geometry(self._syms + other.symbols,
+                           numpy.vstack([self._xyzs, other.coordinates]))
+        else:
+            ret = tuple(self) + tuple(other)
+        return ret
+
+    def __radd__(self, other):
+        return tuple(other) + tuple(self)
+
+    def __reduce__(self):
+        return (Geometry, (self._syms, self._xyzs))
+
+    def __repr__(self):
+        return 'Geometry({})'.format(repr(tuple(self)))
+
+
+def _intern_symbols(syms):
+    """ interned symbols and the corresponding atomic number array
+    """
+    syms, nums = (zip(*map(_symbol_record, syms)) if len(syms) else
+                  ((), ()))
+    nums = numpy.array(nums, dtype=numpy.int64)
+    nums.flags.writeable = False
+    return tuple(syms), nums
+
+
+@functools.lru_cache(maxsize=None)
+def _element_symbol(sym):
+    """ standard element symbol, computed once per input symbol
+    """
+    return pt.to_E(sym)
+
+
+@functools.lru_cache(maxsize=None)
+def _symbol_record(sym):
+    """ interned symbol and atomic number, computed once per symbol
+    """
+    return sys.intern(str(sym)), pt.to_Z(sym)
+
+
+class GeometryEnsemble():
+    """ an immutable stack of geometries that share the same atoms
+
+    The coordinates are held as one contiguous, read-only (nconfs, natms, 3)
+    array. Indexing with an integer gives back a compact `Geometry`; indexing
+    with a slice or an index array gives a smaller ensemble.
+    """
+    __slots__ = ('_syms', '_nums', '_xyzs')
+
+    def __init__(self, syms, xyzs_lst):
+        syms, nums = _intern_symbols(syms)
+        xyzs_lst = numpy.array(xyzs_lst, dtype=numpy.float64, order='C')
+        xyzs_lst = numpy.reshape(xyzs_lst, (-1, len(syms), 3))
+        xyzs_lst.flags.writeable = False
+
+        self._syms = syms
+        self._nums = nums
+        self._xyzs = xyzs_lst
+
+    @property
+    def symbols(self):
+        """ atomic symbols, shared by all geometries in the ensemble
+        """
+        return self._syms
+
+    @property
+    def numbers(self):
+        """ atomic numbers, as a read-only integer array
+        """
+        return self._nums
+
+    @property
+    def coordinates(self):
+        """ atomic coordinates, as a read-only (nconfs, natms, 3) array
+        """
+        return self._xyzs
+
+    def __len__(self):
+        return len(self._xyzs)
+
+    def __iter__(self):
+        return (Geometry(self._syms, xyzs) for xyzs in self._xyzs)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, numpy.integer)):
+            return Geometry(self._syms, self._xyzs[idx])
+        return GeometryEnsemble(self._syms, self._xyzs[idx])
+
+    def __reduce__(self):
+        return (GeometryEnsemble, (self._syms, self._xyzs))
+
+    def __repr__(self):
+        return 'GeometryEnsemble(<{:d} geometries of {:d} atoms>)'.format(
+            *numpy.shape(self._xyzs)[:2])
@@ -1,8 +1,9 @@
 """ cartesian geometries
 """
 
+import io
+import struct
 import itertools
-import functools
 import more_itertools as mit
 import numpy
 from qcelemental import periodictable as pt
@@ -13,23 +14,38 @@ import automol.create.geom
 import automol.convert.geom
 import automol.convert.inchi
 from automol import cart
-from automol.convert._pyx2z import to_oriented_geometry
+from automol.create.geom import Geometry
+from automol.create.geom import GeometryEnsemble
 
 BOHR2ANG = qcc.conversion_factor('bohr', 'angstrom')
 RAD2DEG = qcc.conversion_factor('radian', 'degree')
 
 
 # constructor
-def from_data(syms, xyzs, angstrom=False):
+def from_data(syms, xyzs, angstrom=False, as_array=False):
     """ geometry data structure from symbols and coordinates
+
+    :param as_array: return an array-backed `Geometry` instead of a tuple
     """
     return automol.create.geom.from_data(
-        symbols=syms, coordinates=xyzs, angstrom=angstrom)
+        symbols=syms, coordinates=xyzs, angstrom=angstrom, as_array=as_array)
+
+
+def compact(geo):
+    """ convert a geometry to the compact, array-backed `Geometry` form
+    """
+    if not isinstance(geo, Geometry):
+        syms, xyzs = zip(*geo) if geo else ((), ())
+        geo = Geometry(syms, xyzs)
+    return geo
 
 
 def from_subset(geo, idxs):
     """ generate a new geometry from a subset of the atoms
     """
+    if isinstance(geo, Geometry):
+        return geo.subset(idxs)
+
     syms = symbols(geo)
     xyzs = coordinates(geo)
 
@@ -42,31 +58,49 @@ def from_subset(geo, idxs):
 def symbols(geo, idxs=None):
     """ atomic symbols
     """
-    idxs = list(range(count(geo))) if idxs is None else idxs
-
-    if geo:
+    if isinstance(geo, Geometry):
+        syms = geo.symbols
+    elif geo:
         syms, _ = zip(*geo)
     else:
         syms = ()
 
-    syms = tuple(sym for idx, sym in enumerate(syms) if idx in idxs)
+    if idxs is not None:
+        syms = tuple(map(syms.__getitem__, _selection(len(syms), idxs)))
     return syms
 
 
 def coordinates(geo, idxs=None, angstrom=False):
     """ atomic coordinates
     """
-    idxs = list(range(count(geo))) if idxs is None else idxs
+    if isinstance(geo, Geometry):
+        xyzs = geo.coordinates
+        xyzs = xyzs if idxs is None else xyzs[_selection(len(xyzs), idxs)]
+        # (angstrom conversions give array rows, as for the tuple form)
+        return (tuple(map(tuple, xyzs.tolist())) if not angstrom else
+                tuple(numpy.multiply(xyzs, BOHR2ANG)))
+
     if geo:
         _, xyzs = zip(*geo)
     else:
         xyzs = ()
     xyzs = xyzs if not angstrom else numpy.multiply(
         xyzs, qcc.conversion_factor('bohr', 'angstrom'))
-    xyzs = tuple(xyz for idx, xyz in enumerate(xyzs) if idx in idxs)
+    if idxs is not None:
+        xyzs = tuple(map(xyzs.__getitem__, _selection(len(xyzs), idxs)))
+    else:
+        xyzs = tuple(xyzs)
     return xyzs
 
 
+def _selection(natms, idxs):
+    """ the in-range indices from a selection, sorted and without repeats
+
+    (this is the order in which the getters have always returned a subset)
+    """
+    return sorted(set(idx for idx in idxs if 0 <= idx < natms))
+
+
 def count(geo):
     """ count the number of atoms in the geometry
     """
@@ -185,6 +219,31 @@ def connectivity_graph(geo,
     return gra
 
 
+def connectivity_changes(geos, rqq_bond_max=3.5, rqh_bond_max=2.6,
+                         rhh_bond_max=1.9, skin=1.):
+    """ bonds formed and broken along a trajectory, frame by frame
+
+    Bonding is tracked incrementally (see
+    `automol.convert.geom.ConnectivityTracker`) rather than perceived from
+    scratch for each frame.
+
+    :param geos: the trajectory geometries (any iterable)
+    :param skin: extra search radius that lets neighbor lists be reused
+    :returns: a generator of transformations (formed and broken bond keys),
+        one per frame and each relative to the frame before; the first is
+        empty
+    """
+    geos = iter(geos)
+    geo = next(geos, None)
+    if geo is not None:
+        trk = automol.convert.geom.ConnectivityTracker(
+            geo, rqq_bond_max=rqq_bond_max, rqh_bond_max=rqh_bond_max,
+            rhh_bond_max=rhh_bond_max, skin=skin)
+        yield automol.graph.trans.old_from_data((), ())
+        for geo in geos:
+            yield trk.update(geo)
+
+
 def components_graph(geo, remove_stereo=False):
     """ geometry => connected components graphs
     """
@@ -306,12 +365,78 @@ def join(geo1, geo2,
 # I/O
 def from_string(geo_str, angstrom=True):
     """ read a cartesian geometry from a string
+
+    A plain block of `sym x y z` lines is tokenized directly; anything else
+    (surrounding text, multiple blocks, unusual number formats) goes through
+    the `autoread` parser.
     """
-    syms, xyzs = ar.geom.read(geo_str)
+    rows = _plain_geometry_rows(geo_str)
+    xyzs = _plain_geometry_values(rows) if rows is not None else None
+    if xyzs is not None:
+        syms = [row[0] for row in rows]
+    else:
+        syms, xyzs = ar.geom.read(geo_str)
     geo = from_data(syms, xyzs, angstrom=angstrom)
     return geo
 
 
+def from_strings(geo_strs, angstrom=True):
+    """ read many cartesian geometries from strings, in one pass
+
+    The coordinates of all plain `sym x y z` blocks are converted to numbers
+    together; any other strings are read as in `from_string`.
+    """
+    geo_strs = tuple(geo_strs)
+    rows_lst = list(map(_plain_geometry_rows, geo_strs))
+    xyzs = _plain_geometry_values(
+        list(itertools.chain(*(rows for rows in rows_lst if rows))))
+    if xyzs is None:
+        # some block only parses with autoread, so read them one by one
+        return tuple(from_string(geo_str, angstrom=angstrom)
+                     for geo_str in geo_strs)
+
+    geos = []
+    start = 0
+    for geo_str, rows in zip(geo_strs, rows_lst):
+        if rows is not None:
+            syms = [row[0] for row in rows]
+            geos.append(from_data(syms, xyzs[start:start+len(rows)],
+                                  angstrom=angstrom))
+            start += len(rows)
+        else:
+            geos.append(from_string(geo_str, angstrom=angstrom))
+    return tuple(geos)
+
+
+def _plain_geometry_rows(geo_str):
+    """ split a plain block of `sym x y z` lines into rows of tokens
+
+    :returns: the rows, or None if this is not a plain block
+    """
+    rows = [line.split() for line in geo_str.strip().splitlines()]
+    if not rows or '_' in geo_str or not all(
+            len(row) == 4 and len(row[0]) <= 2 and row[0].isalpha() and
+            row[0].isascii() for row in rows):
+        rows = None
+    return rows
+
+
+def _plain_geometry_values(rows):
+    """ convert the coordinate columns of the rows in bulk
+
+    :returns: an (n, 3) array, or None if some value is not a finite number
+    """
+    try:
+        xyzs = (numpy.array(rows)[:, 1:].astype(float) if rows else
+                numpy.zeros((0, 3)))
+    except ValueError:
+        xyzs = None
+
+    if xyzs is not None and not numpy.all(numpy.isfinite(xyzs)):
+        xyzs = None
+    return xyzs
+
+
 def from_xyz_string(xyz_str):
     """ read a cartesian geometry from a .xyz string
     """
@@ -353,28 +478,197 @@ def xyz_trajectory_string(geo_lst, comments=None):
 def from_xyz_trajectory_string(geo_str):
     """ read a series of cartesian geometries from a .xyz string
     """
+    frames = tuple(read_xyz_trajectory(io.StringIO(geo_str)))
+    geoms, comments = (tuple(zip(*frames)) if frames else ((), ()))
+    return (geoms, comments)
 
-    def _blocks(lst, size):
-        """ Split list into parts of size n"""
-        split_lst = []
-        for i in range(0, len(lst), size):
-            split_lst.append(lst[i:i + size])
-        return split_lst
 
-    # Split the lines for iteration
-    geo_lines = [line for line in geo_str.splitlines()
-                 if line != '']
+def read_xyz_trajectory(xyz_file):
+    """ read cartesian geometries one by one from a .xyz trajectory file
 
-    # Get the number of atoms used to partition the trajectory file
-    line1 = geo_lines[0].strip()
-    natoms = int(line1)
+    Only one frame is held in memory at a time.
 
-    geoms, comments = tuple(), tuple()
-    for block in _blocks(geo_lines, natoms+2):
-        comments += (block[1],)
-        geoms += (from_string('\n'.join(block[2:])),)
+    :param xyz_file: an open file, or any iterable over lines
+    :returns: a generator of (geometry, comment) pairs
+    """
+    lines = iter(xyz_file)
+    for line in lines:
+        if not line.strip():
+            continue
+
+        natms = int(line)
+        try:
+            comment = next(lines).rstrip('\r\n')
+        except StopIteration:
+            raise ValueError(
+                'Trajectory frame cut short after its atom count') from None
+        block = list(itertools.islice(lines, natms))
+        if len(block) != natms:
+            raise ValueError(
+                'Trajectory frame cut short:\n' + ''.join(block))
+        yield from_string(''.join(block)), comment
+
+
+_MISSING = object()
+
+
+def _with_comments(geos, comments, default=None):
+    """ pair up geometries with their comments, which must match in number
+
+    :param default: the comment for every geometry, if `comments` is None
+    """
+    if comments is None:
+        comments = itertools.repeat(default)
+        pairs = zip(geos, comments)
+    else:
+        pairs = itertools.zip_longest(geos, comments, fillvalue=_MISSING)
+
+    for geo, comment in pairs:
+        if geo is _MISSING or comment is _MISSING:
+            raise ValueError('The numbers of geometries and comments differ')
+        yield geo, comment
+
+
+def write_xyz_trajectory(xyz_file, geos, comments=None):
+    """ write cartesian geometries one by one to a .xyz trajectory file
+
+    The output matches `xyz_trajectory_string`, but the geometries can come
+    from any iterable and are written as they arrive.
+
+    :param xyz_file: an open, writable file
+    :param comments: comments for each geometry (any iterable)
+    """
+    syms = None
+    for idx, (geo, comment) in enumerate(_with_comments(geos, comments)):
+        syms = symbols(geo) if syms is None else syms
+        assert symbols(geo) == syms
+        xyz_file.write(('\n' if idx else '') +
+                       xyz_string(geo, comment=comment))
+
+
+# binary trajectories
+BINARY_TRAJECTORY_MAGIC = b'AMOLTRJ\x00'
+BINARY_TRAJECTORY_VERSION = 1
+# version, atom count, frame count, length of the comment block in bytes
+_BINARY_TRAJECTORY_HEADER = struct.Struct('<4Q')
+_BINARY_TRAJECTORY_SYMBOL = numpy.dtype('S4')
+_BINARY_TRAJECTORY_VALUE = numpy.dtype('<f8')
+
+
+def write_binary_trajectory(file_name, geos, comments=None):
+    """ write cartesian geometries to a compact binary trajectory file
+
+    Layout: an 8-byte magic string, a header of four little-endian uint64s
+    (version, atom count, frame count, comment block size), the atomic
+    symbols as 4-byte strings padded to an 8-byte boundary, then the
+    coordinates (bohr) as one (nframes, natms, 3) block of little-endian
+    float64s, then the comments as newline-separated UTF-8.
+
+    The geometries can come from any iterable and are written as they
+    arrive; the header is completed once all of them are written.
+
+    :param file_name: path to the file to write
+    :param comments: comments for each geometry (any iterable)
+    """
+    with open(file_name, 'wb') as bin_file:
+        bin_file.write(BINARY_TRAJECTORY_MAGIC)
+        bin_file.write(_BINARY_TRAJECTORY_HEADER.pack(0, 0, 0, 0))
+
+        syms = None
+        comment_lst = []
+        for geo, comment in _with_comments(geos, comments, default=''):
+            # as in the xyz writer, a missing comment is an empty one
+            comment = '' if comment is None else comment
+            if syms is None:
+                syms = symbols(geo)
+                _write_binary_symbols(bin_file, syms)
+            assert symbols(geo) == syms
+            assert '\n' not in comment
+            xyzs = _coordinate_array(geo).astype(_BINARY_TRAJECTORY_VALUE)
+            bin_file.write(xyzs.tobytes())
+            comment_lst.append(comment)
+
+        if syms is None:
+            syms = ()
+            _write_binary_symbols(bin_file, syms)
+
+        comment_bytes = '\n'.join(comment_lst).encode('utf-8')
+        bin_file.write(comment_bytes)
+
+        bin_file.seek(len(BINARY_TRAJECTORY_MAGIC))
+        bin_file.write(_BINARY_TRAJECTORY_HEADER.pack(
+            BINARY_TRAJECTORY_VERSION, len(syms), len(comment_lst),
+            len(comment_bytes)))
+
+
+def open_binary_trajectory(file_name):
+    """ open a binary trajectory file for lazy, random access by frame
+
+    (see `write_binary_trajectory` for the format)
+    """
+    return BinaryTrajectory(file_name)
 
-    return (geoms, comments)
+
+class BinaryTrajectory():
+    """ a binary trajectory file, memory-mapped for access by frame
+
+    Indexing with an integer reads that one frame as a compact `Geometry`;
+    indexing with a slice reads those frames as a `GeometryEnsemble`. The
+    rest of the file is never loaded.
+    """
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        with open(file_name, 'rb') as bin_file:
+            magic = bin_file.read(len(BINARY_TRAJECTORY_MAGIC))
+            assert magic == BINARY_TRAJECTORY_MAGIC, (
+                '{} is not a binary trajectory file'.format(file_name))
+            vers, natms, nframes, ncbytes = _BINARY_TRAJECTORY_HEADER.unpack(
+                bin_file.read(_BINARY_TRAJECTORY_HEADER.size))
+            assert vers == BINARY_TRAJECTORY_VERSION, (
+                'Unsupported binary trajectory version {}'.format(vers))
+
+            syms_bytes = bin_file.read(_binary_symbols_size(natms))
+            syms = numpy.frombuffer(syms_bytes, _BINARY_TRAJECTORY_SYMBOL,
+                                    count=natms)
+            self.symbols = tuple(sym.decode('ascii') for sym in syms)
+
+            offset = bin_file.tell()
+            frame_size = natms * 3 * _BINARY_TRAJECTORY_VALUE.itemsize
+            bin_file.seek(offset + nframes * frame_size)
+            comment_str = bin_file.read(ncbytes).decode('utf-8')
+            self.comments = (tuple(comment_str.split('\n')) if nframes else
+                             ())
+
+        self.coordinates = (
+            numpy.memmap(file_name, dtype=_BINARY_TRAJECTORY_VALUE, mode='r',
+                         offset=offset, shape=(nframes, natms, 3))
+            if nframes and natms else
+            numpy.zeros((nframes, natms, 3)))
+
+    def __len__(self):
+        return len(self.coordinates)
+
+    def __iter__(self):
+        return (self[idx] for idx in range(len(self)))
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, numpy.integer)):
+            return Geometry(self.symbols, self.coordinates[idx])
+        return GeometryEnsemble(self.symbols, self.coordinates[idx])
+
+
+def _write_binary_symbols(bin_file, syms):
+    syms_arr = numpy.array(syms, dtype=_BINARY_TRAJECTORY_SYMBOL)
+    syms_bytes = syms_arr.tobytes()
+    bin_file.write(syms_bytes.ljust(_binary_symbols_size(len(syms)), b'\x00'))
+
+
+def _binary_symbols_size(natms):
+    """ size of the symbol block, padded to keep the frames 8-byte aligned
+    """
+    nbytes = natms * _BINARY_TRAJECTORY_SYMBOL.itemsize
+    return nbytes + (-nbytes) % 8
 
 
 # representations
@@ -389,21 +683,25 @@ def coulomb_spectrum(geo):
 def _coulomb_matrix(geo):
     nums = numpy.array(list(map(pt.to_Z, symbols(geo))))
     xyzs = numpy.array(coordinates(geo))
+    return _coulomb_matrices(nums, xyzs[numpy.newaxis])[0]
 
+
+def _coulomb_matrices(nums, xyzs_lst):
+    """ coulomb matrices for a (nconfs, natms, 3) stack of coordinates
+    """
     _ = numpy.newaxis
     natms = len(nums)
     diag_idxs = numpy.diag_indices(natms)
-    tril_idxs = numpy.tril_indices(natms, -1)
-    triu_idxs = numpy.triu_indices(natms, 1)
+    offd_idxs = ~numpy.eye(natms, dtype=bool)
 
     zxz = numpy.outer(nums, nums)
-    rmr = numpy.linalg.norm(xyzs[:, _, :] - xyzs[_, :, :], axis=2)
+    dxyzs = xyzs_lst[:, :, _, :] - xyzs_lst[:, _, :, :]
+    rmr = numpy.sqrt(numpy.einsum('nijk,nijk->nij', dxyzs, dxyzs))
 
-    mat = numpy.zeros((natms, natms))
-    mat[diag_idxs] = nums ** 2.4 / 2.
-    mat[tril_idxs] = zxz[tril_idxs] / rmr[tril_idxs]
-    mat[triu_idxs] = zxz[triu_idxs] / rmr[triu_idxs]
-    return mat
+    mats = numpy.zeros((len(xyzs_lst), natms, natms))
+    mats[:, diag_idxs[0], diag_idxs[1]] = nums ** 2.4 / 2.
+    mats[:, offd_idxs] = zxz[offd_idxs] / rmr[:, offd_idxs]
+    return mats
 
 
 # comparisons
@@ -416,13 +714,16 @@ def almost_equal(geo1, geo2, rtol=2e-3):
     return ret
 
 
-def minimum_distance(geo1, geo2):
+def minimum_distance(geo1, geo2, block_size=None):
     """ get the minimum distance between atoms in geo1 and those in geo2
+
+    :param block_size: if set, compare `block_size` atoms of geo1 at a time
     """
-    xyzs1 = coordinates(geo1)
-    xyzs2 = coordinates(geo2)
-    return min(cart.vec.distance(xyz1, xyz2)
-               for xyz1, xyz2 in itertools.product(xyzs1, xyzs2))
+    xyzs1 = _coordinate_array(geo1)
+    xyzs2 = _coordinate_array(geo2)
+    return min(numpy.min(dist_blk) for _, dist_blk in
+               cart.vec.pairwise_distance_blocks(xyzs1, xyzs2,
+                                                 block_size=block_size))
 
 
 def almost_equal_coulomb_spectrum(geo1, geo2, rtol=1e-2):
@@ -436,22 +737,94 @@ def almost_equal_coulomb_spectrum(geo1, geo2, rtol=1e-2):
 def argunique_coulomb_spectrum(geos, seen_geos=(), rtol=1e-2):
     """ get indices of unique geometries, by coulomb spectrum
     """
-    comp_ = functools.partial(almost_equal_coulomb_spectrum, rtol=rtol)
-    idxs = _argunique(geos, comp_, seen_items=seen_geos)
+    idx_ = CoulombSpectrumIndex(seen_geos, rtol=rtol)
+    idxs = tuple(idx for idx, geo in enumerate(geos) if idx_.add(geo))
     return idxs
 
 
-def _argunique(items, comparison, seen_items=()):
-    """ get the indices of unique items using some comparison function
-    """
-    idxs = []
-    seen_items = list(seen_items)
-    for idx, item in enumerate(items):
-        if not any(comparison(item, seen_item) for seen_item in seen_items):
-            idxs.append(idx)
-            seen_items.append(item)
-    idxs = tuple(idxs)
-    return idxs
+class CoulombSpectrumIndex():
+    """ an incremental index of geometries, unique by coulomb spectrum
+
+    Two geometries count as duplicates under the same test as
+    `almost_equal_coulomb_spectrum`, but each spectrum is computed only once
+    and new spectra are only compared against the few stored ones that fall
+    in nearby buckets. The buckets are a grid over the logarithms of the
+    largest `ndim` eigenvalues; the range of buckets searched for a query is
+    derived from the `rtol` bounds, so no duplicate can be missed.
+    """
+
+    def __init__(self, geos=(), rtol=1e-2, ndim=3):
+        assert 0. < rtol < 1.
+        self.rtol = rtol
+        self.ndim = ndim
+        self._atol = 1e-8       # the numpy.allclose default
+        self._width = -numpy.log1p(-rtol)
+        self._specs = []
+        self._bucket_dct = {}
+        for geo in geos:
+            self.add_spectrum(coulomb_spectrum(geo), force=True)
+
+    def __len__(self):
+        return len(self._specs)
+
+    def __contains__(self, geo):
+        return self.contains_spectrum(coulomb_spectrum(geo))
+
+    def add(self, geo):
+        """ add a geometry to the index, unless it is a duplicate
+
+        :returns: whether the geometry was new and added
+        """
+        return self.add_spectrum(coulomb_spectrum(geo))
+
+    def add_spectrum(self, spec, force=False):
+        """ add a coulomb spectrum to the index, unless it is a duplicate
+
+        :param force: add it without checking for duplicates
+        :returns: whether the spectrum was added
+        """
+        spec = numpy.asarray(spec, dtype=float)
+        if not force and self.contains_spectrum(spec):
+            return False
+
+        key = tuple(map(self._bucket, spec[-self.ndim:]))
+        self._bucket_dct.setdefault((len(spec),) + key, []).append(
+            len(self._specs))
+        self._specs.append(spec)
+        return True
+
+    def contains_spectrum(self, spec):
+        """ is there an equivalent coulomb spectrum in the index?
+        """
+        spec = numpy.asarray(spec, dtype=float)
+        rngs = [range(self._bucket(lo), self._bucket(hi) + 1)
+                for lo, hi in map(self._bounds, spec[-self.ndim:])]
+        cand_idxs = list(itertools.chain(*(
+            self._bucket_dct.get((len(spec),) + key, ())
+            for key in itertools.product(*rngs))))
+
+        ret = False
+        if cand_idxs:
+            cand_specs = numpy.array([self._specs[i] for i in cand_idxs])
+            ret = bool(numpy.any(numpy.all(
+                numpy.abs(spec - cand_specs) <=
+                self._atol + self.rtol * numpy.abs(cand_specs), axis=1)))
+        return ret
+
+    def _bounds(self, val):
+        """ the range of stored values that could be equivalent to `val`
+        """
+        atol, rtol = self._atol, self.rtol
+        lo_ = min((val - atol) / (1. + rtol), (val - atol) / (1. - rtol))
+        hi_ = max((val + atol) / (1. - rtol), (val + atol) / (1. + rtol))
+        # pad against round-off at the bucket edges
+        return lo_ - 1e-9 * abs(lo_), hi_ + 1e-9 * abs(hi_)
+
+    def _bucket(self, val):
+        """ bucket index for a value (monotonic; small values share a bucket)
+        """
+        return (int(numpy.floor(numpy.log(val) / self._width)) if val >= 1.
+                else -1)
 
 
 # transformations
@@ -680,9 +1053,8 @@ def _swap_for_one(geo, hyds):
 def distance(geo, idx1, idx2, angstrom=False):
     """ measure the distance between atoms
     """
-    xyzs = coordinates(geo)
-    xyz1 = xyzs[idx1]
-    xyz2 = xyzs[idx2]
+    xyz1 = _coordinate(geo, idx1)
+    xyz2 = _coordinate(geo, idx2)
     dist = cart.vec.distance(xyz1, xyz2)
     dist *= BOHR2ANG if angstrom else 1
     return dist
@@ -691,10 +1063,9 @@ def distance(geo, idx1, idx2, angstrom=False):
 def central_angle(geo, idx1, idx2, idx3, degree=False):
     """ measure the angle inscribed by three atoms
     """
-    xyzs = coordinates(geo)
-    xyz1 = xyzs[idx1]
-    xyz2 = xyzs[idx2]
-    xyz3 = xyzs[idx3]
+    xyz1 = _coordinate(geo, idx1)
+    xyz2 = _coordinate(geo, idx2)
+    xyz3 = _coordinate(geo, idx3)
     ang = cart.vec.central_angle(xyz1, xyz2, xyz3)
     ang *= RAD2DEG if degree else 1
     return ang
@@ -703,38 +1074,61 @@ def central_angle(geo, idx1, idx2, idx3, degree=False):
 def dihedral_angle(geo, idx1, idx2, idx3, idx4, degree=False):
     """ measure the dihedral angle defined by four atoms
     """
-    xyzs = coordinates(geo)
-    xyz1 = xyzs[idx1]
-    xyz2 = xyzs[idx2]
-    xyz3 = xyzs[idx3]
-    xyz4 = xyzs[idx4]
+    xyz1 = _coordinate(geo, idx1)
+    xyz2 = _coordinate(geo, idx2)
+    xyz3 = _coordinate(geo, idx3)
+    xyz4 = _coordinate(geo, idx4)
     dih = cart.vec.dihedral_angle(xyz1, xyz2, xyz3, xyz4)
     dih *= RAD2DEG if degree else 1
     return dih
 
 
-def distance_matrix(geo):
+def distance_matrix(geo, block_size=None):
     """form distance matrix for a set of xyz coordinates
+
+    :param block_size: if set, build the matrix `block_size` rows at a time
     """
-    mat = numpy.zeros((len(geo), len(geo)))
-    for i in range(len(geo)):
-        for j in range(len(geo)):
-            mat[i][j] = distance(geo, i, j)
-    return mat
+    xyzs = _coordinate_array(geo)
+    return cart.vec.pairwise_distances(xyzs, xyzs, block_size=block_size)
 
 
-def almost_equal_dist_matrix(geo1, geo2, thresh=0.1):
+def almost_equal_dist_matrix(geo1, geo2, thresh=0.1, block_size=64):
     """form distance matrix for a set of xyz coordinates
+
+    The distance matrices are compared `block_size` rows at a time, returning
+    as soon as any distance differs by more than `thresh`.
     """
-    for i in range(len(geo1)):
-        for j in range(len(geo1)):
-            dist_mat1_ij = distance(geo1, i, j)
-            dist_mat2_ij = distance(geo2, i, j)
-            if abs(dist_mat1_ij - dist_mat2_ij) > thresh:
-                return False
+    xyzs1 = _coordinate_array(geo1)
+    xyzs2 = _coordinate_array(geo2)
+    if len(xyzs1) != len(xyzs2):
+        return False
+
+    blks1 = cart.vec.pairwise_distance_blocks(xyzs1, xyzs1, block_size)
+    blks2 = cart.vec.pairwise_distance_blocks(xyzs2, xyzs2, block_size)
+    for (_, dist_blk1), (_, dist_blk2) in zip(blks1, blks2):
+        if numpy.any(numpy.abs(dist_blk1 - dist_blk2) > thresh):
+            return False
     return True
 
 
+def _coordinate(geo, idx):
+    """ the coordinates of one atom, without extracting the rest
+    """
+    _, xyz = geo[idx]
+    return xyz
+
+
+def _coordinate_array(geo):
+    """ the coordinates as an (n, 3) array (a read-only view, if compact)
+    """
+    if isinstance(geo, Geometry):
+        xyzs = geo.coordinates
+    else:
+        xyzs = numpy.reshape(numpy.array(coordinates(geo), dtype=float),
+                             (-1, 3))
+    return xyzs
+
+
 def external_symmetry_factor(geo):
     """ obtain external symmetry factor for a geometry using x2z
     """
@@ -742,10 +1136,10 @@ def external_symmetry_factor(geo):
     if automol.geom.is_atom(geo):
         ext_sym_fac = 1.
     else:
-        oriented_geom = to_oriented_geometry(geo)
-        ext_sym_fac = oriented_geom.sym_num()
+        x2z = automol.convert.geom.x2z_analysis(geo)
+        ext_sym_fac = x2z.symmetry_number()
         # Divide symmetry number by enantiomeric factor
-        if oriented_geom.is_enantiomer():
+        if x2z.is_enantiomer():
             ext_sym_fac *= 0.5
     return ext_sym_fac
 
@@ -1043,6 +1437,97 @@ def permutation(geo, ref_geo, thresh=1e-4):
     return perm_idxs
 
 
+# conformer ensembles
+def ensemble(geos):
+    """ stack geometries of the same atoms into a `GeometryEnsemble`
+    """
+    geos = tuple(geos)
+    assert geos, 'An ensemble needs at least one geometry'
+    syms = symbols(geos[0])
+    assert all(symbols(geo) == syms for geo in geos[1:]), (
+        'All geometries in an ensemble must have the same atoms')
+    xyzs_lst = [_coordinate_array(geo) for geo in geos]
+    return GeometryEnsemble(syms, xyzs_lst)
+
+
+def ensemble_distance_matrices(ens):
+    """ distance matrices for each geometry, as an (nconfs, natms, natms) array
+    """
+    xyzs_lst = ens.coordinates
+    dxyzs = (xyzs_lst[:, :, numpy.newaxis, :] -
+             xyzs_lst[:, numpy.newaxis, :, :])
+    return numpy.sqrt(numpy.einsum('nijk,nijk->nij', dxyzs, dxyzs))
+
+
+def ensemble_coulomb_spectra(ens):
+    """ (sorted) coulomb spectra for each geometry, as an (nconfs, natms) array
+    """
+    mats = _coulomb_matrices(ens.numbers, ens.coordinates)
+    return numpy.linalg.eigvalsh(mats)
+
+
+def ensemble_center_of_mass(ens):
+    """ centers of mass for each geometry, as an (nconfs, 3) array
+    """
+    amas = numpy.array(masses(ens[0]))
+    return numpy.einsum('a,nak->nk', amas, ens.coordinates) / numpy.sum(amas)
+
+
+def ensemble_inertia_tensors(ens, amu=True):
+    """ inertia tensors for each geometry, as an (nconfs, 3, 3) array
+    """
+    amas = numpy.array(masses(ens[0], amu=amu))
+    cm_xyzs = ensemble_center_of_mass(ens)
+    xyzs_lst = ens.coordinates - cm_xyzs[:, numpy.newaxis, :]
+
+    rsqs = numpy.einsum('a,nak,nak->n', amas, xyzs_lst, xyzs_lst)
+    outs = numpy.einsum('a,nai,naj->nij', amas, xyzs_lst, xyzs_lst)
+    return rsqs[:, numpy.newaxis, numpy.newaxis] * numpy.eye(3) - outs
+
+
+def ensemble_rotational_constants(ens, amu=True):
+    """ rotational constants for each geometry, as an (nconfs, 3) array
+    """
+    moms = numpy.linalg.eigvalsh(ensemble_inertia_tensors(ens, amu=amu))
+    sol = (qcc.get('speed of light in vacuum') *
+           qcc.conversion_factor('meter / second', 'bohr hartree / h'))
+    cons = numpy.divide(1., moms) / 4. / numpy.pi / sol
+    return cons
+
+
+def ensemble_dihedral_angles(ens, idx1, idx2, idx3, idx4, degree=False):
+    """ a dihedral angle measured in each geometry, as an (nconfs,) array
+    """
+    xyzs_lst = ens.coordinates
+    xyz1, xyz2, xyz3, xyz4 = (
+        xyzs_lst[:, idx, :] for idx in (idx1, idx2, idx3, idx4))
+
+    def _unit(vecs):
+        return vecs / numpy.linalg.norm(vecs, axis=1)[:, numpy.newaxis]
+
+    def _unit_perpendicular(vecs1, vecs2):
+        # (zero for parallel vectors, as in cart.vec.unit_perpendicular)
+        vecs = numpy.cross(vecs1, vecs2)
+        norms = numpy.linalg.norm(vecs, axis=1)
+        norms = numpy.where(norms > 1e-7, norms, numpy.inf)
+        return vecs / norms[:, numpy.newaxis]
+
+    uxyz21 = _unit(xyz1 - xyz2)
+    uxyz23 = _unit(xyz3 - xyz2)
+    uxyz34 = _unit(xyz4 - xyz3)
+    uxyz123_perp = _unit_perpendicular(uxyz21, uxyz23)
+    uxyz234_perp = _unit_perpendicular(-uxyz23, uxyz34)
+
+    coss = numpy.einsum('nk,nk->n', uxyz123_perp, uxyz234_perp)
+    vals = numpy.einsum('nk,nk->n', uxyz123_perp, uxyz34)
+    signs = numpy.where(vals < 0., 1., -1.)
+
+    dihs = signs * numpy.arccos(numpy.clip(coss, -1., 1.))
+    dihs = numpy.mod(dihs, 2*numpy.pi)
+    dihs *= RAD2DEG if degree else 1
+    return dihs
+
+
 if __name__ == '__main__':
     GEO_STR = """
 C    0.000000   0.000000   0.000000
@@ -1,5 +1,8 @@
 """ molecular graph
 """
+# immutable graph objects
+from automol.graph._graph_base import Graph
+from automol.graph._graph_base import immutable
 # getters
 from automol.graph._graph_base import atoms
 from automol.graph._graph_base import bonds
@@ -39,6 +42,7 @@ from automol.graph._graph import heavy_atom_count
 from automol.graph._graph import atom_neighbor_keys
 from automol.graph._graph import atom_bond_keys
 from automol.graph._graph import atom_neighborhoods
+from automol.graph._graph_base import adjacency
 from automol.graph._graph import atom_groups
 from automol.graph._res import radical_groups
 from automol.graph._res import radical_group_dct
@@ -83,7 +87,17 @@ from automol.graph._graph import full_isomorphism
 from automol.graph._graph import full_subgraph_isomorphism
 from automol.graph._graph import backbone_isomorphic
 from automol.graph._graph import backbone_isomorphism
+from automol.graph._graph import automorphisms
 from automol.graph._graph import backbone_unique
+from automol.graph._graph import ISOMORPHISM_BACKENDS
+from automol.graph._graph import set_isomorphism_backend
+from automol.graph._graph import isomorphism_backend
+from automol.graph._graph import full_hash
+from automol.graph._graph import backbone_hash
+from automol.graph._graph import canonical_keys
+from automol.graph._graph import canonical
+from automol.graph._graph import canonical_string
+from automol.graph._graph import canonical_hash
 
 # chemistry library
 # # atom properties
@@ -118,8 +132,10 @@ from automol.graph._res import resonance_avg_bond_orders
 # # transformations
 from automol.graph._res import resonances
 from automol.graph._res import subresonances
+from automol.graph._res import iter_subresonances
 from automol.graph._res import dominant_resonances
 from automol.graph._res import dominant_resonance
+from automol.graph._res import kekule
 from automol.graph._res import rotational_bond_keys
 
 # stereo graph library
@@ -131,6 +147,8 @@ from automol.graph._stereo import stereogenic_atom_keys
 from automol.graph._stereo import stereogenic_bond_keys
 from automol.graph._stereo import stereomers
 from automol.graph._stereo import substereomers
+from automol.graph._stereo import iter_stereomers
+from automol.graph._stereo import iter_substereomers
 from automol.graph._stereo import stereo_sorted_atom_neighbor_keys
 
 # ring graph library
@@ -220,6 +238,9 @@ def formula(gra):
 __all__ = [
     # constructors
     'from_data',
+    # immutable graph objects
+    'Graph',
+    'immutable',
     # getters
     'atoms',
     'bonds',
@@ -260,6 +281,7 @@ __all__ = [
     'atom_neighbor_keys',
     'atom_bond_keys',
     'atom_neighborhoods',
+    'adjacency',
     'atom_groups',
     'radical_groups',
     'radical_group_dct',
@@ -307,7 +329,17 @@ __all__ = [
     'full_subgraph_isomorphism',
     'backbone_isomorphic',
     'backbone_isomorphism',
+    'automorphisms',
     'backbone_unique',
+    'ISOMORPHISM_BACKENDS',
+    'set_isomorphism_backend',
+    'isomorphism_backend',
+    'full_hash',
+    'backbone_hash',
+    'canonical_keys',
+    'canonical',
+    'canonical_string',
+    'canonical_hash',
 
     # chemistry library
     # # atom properties
@@ -339,8 +371,10 @@ __all__ = [
     # # transformations
     'resonances',
     'subresonances',
+    'iter_subresonances',
     'dominant_resonances',
     'dominant_resonance',
+    'kekule',
     'rotational_bond_keys',
 
     # stereo graph library
@@ -352,6 +386,8 @@ __all__ = [
     'stereogenic_bond_keys',
     'stereomers',
     'substereomers',
+    'iter_stereomers',
+    'iter_substereomers',
     'stereo_sorted_atom_neighbor_keys',
 
     # ring graph library
@@ -29,6 +29,7 @@ from automol.graph._graph import without_stereo_parities
 from automol.graph._graph import set_atom_stereo_parities
 from automol.graph._graph import set_bond_stereo_parities
 from automol.graph._graph import connected_components
+from automol.graph._graph_base import immutable
 
 
 def heuristic_geometry(gra):
@@ -36,6 +37,7 @@ def heuristic_geometry(gra):
 
     (need not be connected)
     """
+    gra = immutable(gra)
     assert gra == explicit(gra)
     gra_iter = iter(connected_components(gra))
     gra_ = next(gra_iter)
@@ -58,6 +60,7 @@ def heuristic_geometry(gra):
 def _connected_heuristic_geometry(gra):
     """ stereo-specific coordinates for a connected molecular geometry
     """
+    gra = immutable(gra)
     assert gra == explicit(gra)
 
     atm_keys = sorted(atom_keys(gra))
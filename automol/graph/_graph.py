@@ -2,6 +2,8 @@
 """
 import itertools
 import functools
+import hashlib
+import importlib.util
 import numpy
 import future.moves.itertools as fmit
 from qcelemental import periodictable as pt
@@ -20,8 +22,18 @@ from automol.graph._graph_base import set_atom_stereo_parities
 from automol.graph._graph_base import set_bond_orders
 from automol.graph._graph_base import set_bond_stereo_parities
 from automol.graph._graph_base import relabel
-from automol.graph import _networkx
+from automol.graph._graph_base import adjacency
+from automol.graph._graph_base import immutable
+from automol.graph._graph_base import memoized
+from automol import _lazy
 import automol.create.graph as _create
+_networkx = _lazy.module('automol.graph._networkx')
+_igraph = _lazy.module('automol.graph._igraph')
+
+ISOMORPHISM_BACKENDS = ('igraph', 'networkx')
+_ISO_STATE = {
+    'backend': ('igraph' if importlib.util.find_spec('igraph') is not None
+                else 'networkx')}
 
 
 # setters
@@ -63,6 +75,7 @@ def transform_keys(gra, atm_key_func):
     return relabel(gra, atm_key_dct)
 
 
+@memoized(freeze=immutable)
 def without_bond_orders(gra):
     """ resonance graph with maximum spin (i.e. no pi bonds)
     """
@@ -75,6 +88,7 @@ def without_bond_orders(gra):
     return set_bond_orders(gra, bnd_ord_dct)
 
 
+@memoized(freeze=immutable)
 def without_stereo_parities(gra):
     """ graph with stereo assignments wiped out
     """
@@ -139,31 +153,22 @@ def heavy_atom_count(gra, with_dummy=False):
 def atom_neighbor_keys(gra):
     """ keys of neighboring atoms, by atom
     """
-    def _neighbor_keys(atm_key, atm_nbh):
-        return frozenset(atom_keys(atm_nbh) - {atm_key})
-
-    atm_ngb_keys_dct = dict_.transform_items_to_values(
-        atom_neighborhoods(gra), _neighbor_keys)
-    return atm_ngb_keys_dct
+    return dict(adjacency(gra).atom_neighbor_keys)
 
 
 def atom_bond_keys(gra):
     """ bond keys, by atom
     """
-    return dict_.transform_values(atom_neighborhoods(gra), bond_keys)
+    return dict(adjacency(gra).atom_bond_keys)
 
 
 def atom_neighborhoods(gra):
     """ neighborhood subgraphs, by atom
     """
-    bnd_keys = bond_keys(gra)
-
-    def _neighborhood(atm_key):
-        nbh_bnd_keys = set(filter(lambda x: atm_key in x, bnd_keys))
-        return bond_induced_subgraph(gra, nbh_bnd_keys)
-
-    atm_keys = list(atom_keys(gra))
-    atm_nbh_dct = dict(zip(atm_keys, map(_neighborhood, atm_keys)))
+    atm_bnd_keys_dct = adjacency(gra).atom_bond_keys
+    atm_nbh_dct = {
+        atm_key: bond_induced_subgraph(gra, atm_bnd_keys, check=False)
+        for atm_key, atm_bnd_keys in atm_bnd_keys_dct.items()}
     return atm_nbh_dct
 
 
@@ -171,19 +176,14 @@ def atom_neighborhoods(gra):
 def bond_neighbor_keys(gra):
     """ keys of neighboring bonds, by bond
     """
-    def _neighbor_keys(bnd_key, bnd_nbh):
-        return frozenset(bond_keys(bnd_nbh) - {bnd_key})
-
-    bnd_ngb_keys_dct = dict_.transform_items_to_values(
-        bond_neighborhoods(gra), _neighbor_keys)
-    return bnd_ngb_keys_dct
+    return dict(adjacency(gra).bond_neighbor_keys)
 
 
 def bond_neighbor_bonds(bnd_key, gra):
     """ keys of neighboring bonds, by bond
     """
     atmi, atmj = list(bnd_key)
-    ngb_atm_dct = atom_neighbor_keys(gra)
+    ngb_atm_dct = adjacency(gra).atom_neighbor_keys
     bnds = []
     for atm in [atmi, atmj]:
         alpha_atms = ngb_atm_dct[atm]
@@ -198,13 +198,11 @@ def bond_neighbor_bonds(bnd_key, gra):
 def bond_neighborhoods(gra):
     """ neighborhood subgraphs, by bond
     """
-    bnd_keys = list(bond_keys(gra))
-
-    def _neighborhood(bnd_key):
-        nbh_bnd_keys = set(filter(lambda x: bnd_key & x, bnd_keys))
-        return bond_induced_subgraph(gra, nbh_bnd_keys)
-
-    bnd_nbh_dct = dict(zip(bnd_keys, map(_neighborhood, bnd_keys)))
+    bnd_ngb_keys_dct = adjacency(gra).bond_neighbor_keys
+    bnd_nbh_dct = {
+        bnd_key: bond_induced_subgraph(
+            gra, bnd_ngb_keys | {bnd_key}, check=False)
+        for bnd_key, bnd_ngb_keys in bnd_ngb_keys_dct.items()}
     return bnd_nbh_dct
 
 
@@ -232,7 +230,8 @@ def branch_bond_keys(gra, atm_key, bnd_key):
     bnd_key = frozenset(bnd_key)
     assert atm_key in bnd_key
 
-    atm_bnd_keys_dct = atom_bond_keys(gra)
+    adj = adjacency(gra)
+    atm_bnd_keys_dct = adj.atom_bond_keys
 
     bnch_bnd_keys = {bnd_key}
     seen_bnd_keys = set()
@@ -240,7 +239,7 @@ def branch_bond_keys(gra, atm_key, bnd_key):
 
     new_bnd_keys = {bnd_key}
 
-    bnd_ngb_keys_dct = bond_neighbor_keys(gra)
+    bnd_ngb_keys_dct = adj.bond_neighbor_keys
 
     while new_bnd_keys:
         new_bnd_ngb_keys = set(
@@ -262,6 +261,7 @@ def connected_components(gra):
     return cmp_gras
 
 
+@memoized()
 def connected_components_atom_keys(gra):
     """ atom keys for each connected component in the graph
     """
@@ -291,7 +291,9 @@ def atom_longest_chains(gra):
 
 
 def atom_longest_chain(gra, atm_key):
-    atm_ngb_keys_dct = atom_neighbor_keys(gra)
+    """ longest chain starting from an atom
+    """
+    atm_ngb_keys_dct = adjacency(gra).atom_neighbor_keys
     atm_ngb_keys = atm_ngb_keys_dct[atm_key]
 
     chains_lst = []
@@ -348,12 +350,13 @@ def subgraph(gra, atm_keys):
     return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
 
 
-def bond_induced_subgraph(gra, bnd_keys):
+def bond_induced_subgraph(gra, bnd_keys, check=True):
     """ the subgraph induced by a subset of the bonds
     """
     atm_keys = set(itertools.chain(*bnd_keys))
     bnd_keys = set(bnd_keys)
-    assert atm_keys <= atom_keys(gra)
+    if check:
+        assert atm_keys <= atom_keys(gra)
     atm_dct = dict_.by_key(atoms(gra), atm_keys)
     bnd_dct = dict_.by_key(bonds(gra), bnd_keys)
     return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
@@ -506,6 +509,7 @@ def remove_bonds(gra, bnd_keys, check=True):
     return _create.from_atoms_and_bonds(atm_dct, bnd_dct)
 
 
+@memoized(freeze=immutable)
 def without_dummy_atoms(gra):
     """ remove dummy atoms from the graph
     """
@@ -589,6 +593,7 @@ def atom_explicit_hydrogen_valences(gra):
     return dict_.transform_values(atom_explicit_hydrogen_keys(gra), len)
 
 
+@memoized()
 def atom_explicit_hydrogen_keys(gra):
     """ explicit hydrogen valences, by atom
     """
@@ -601,6 +606,7 @@ def atom_explicit_hydrogen_keys(gra):
 
 
 # # other properties
+@memoized()
 def backbone_keys(gra):
     """ backbone atom keys
     """
@@ -608,11 +614,12 @@ def backbone_keys(gra):
     return bbn_keys
 
 
+@memoized()
 def explicit_hydrogen_keys(gra):
     """ explicit hydrogen keys (H types: explicit, implicit, backbone)
     """
     hyd_keys = dict_.keys_by_value(atom_symbols(gra), lambda x: x == 'H')
-    atm_ngb_keys_dct = atom_neighbor_keys(gra)
+    atm_ngb_keys_dct = adjacency(gra).atom_neighbor_keys
 
     def _is_backbone(hyd_key):
         return all(ngb_key in hyd_keys and hyd_key < ngb_key
@@ -640,6 +647,7 @@ def add_atom_explicit_hydrogen_keys(gra, atm_exp_hyd_keys_dct):
     return gra
 
 
+@memoized(freeze=immutable)
 def implicit(gra, atm_keys=None):
     """ make the hydrogens at these atoms implicit
     """
@@ -656,6 +664,7 @@ def implicit(gra, atm_keys=None):
     return gra
 
 
+@memoized(freeze=immutable)
 def explicit(gra, atm_keys=None):
     """ make the hydrogens at these atoms explicit
     """
@@ -679,24 +688,36 @@ def explicit(gra, atm_keys=None):
 
 
 # # comparisons
+def set_isomorphism_backend(backend):
+    """ choose the library that runs the isomorphism comparisons
+
+    :param backend: 'igraph' (the default, if installed) for the igraph C
+        implementation of VF2, or 'networkx' for the pure-Python reference
+        implementation
+    """
+    assert backend in ISOMORPHISM_BACKENDS, (
+        "{} not in {}".format(backend, ISOMORPHISM_BACKENDS))
+    _ISO_STATE['backend'] = backend
+
+
+def isomorphism_backend():
+    """ the library that runs the isomorphism comparisons
+    """
+    return _ISO_STATE['backend']
+
+
 def full_isomorphism(gra1, gra2):
     """ full graph isomorphism
     """
     assert gra1 == explicit(gra1) and gra2 == explicit(gra2)
-    nxg1 = _networkx.from_graph(gra1)
-    nxg2 = _networkx.from_graph(gra2)
-    iso_dct = _networkx.isomorphism(nxg1, nxg2)
-    return iso_dct
+    return _isomorphism(gra1, gra2)
 
 
 def full_subgraph_isomorphism(gra1, gra2):
     """ gra2 is fully isomorphic to a subgraph of gra1
     """
     assert gra1 == explicit(gra1) and gra2 == explicit(gra2)
-    nxg1 = _networkx.from_graph(gra1)
-    nxg2 = _networkx.from_graph(gra2)
-    iso_dct = _networkx.subgraph_isomorphism(nxg1, nxg2)
-    return iso_dct
+    return _isomorphism(gra1, gra2, sub=True)
 
 
 def backbone_isomorphic(gra1, gra2):
@@ -713,30 +734,184 @@ def backbone_isomorphism(gra1, gra2):
     """
     gra1 = implicit(gra1)
     gra2 = implicit(gra2)
-    nxg1 = _networkx.from_graph(gra1)
-    nxg2 = _networkx.from_graph(gra2)
-    iso_dct = _networkx.isomorphism(nxg1, nxg2)
+    return _isomorphism(gra1, gra2)
+
+
+@memoized()
+def automorphisms(gra):
+    """ the automorphisms of the graph (matching symbols, implicit hydrogens,
+    bond orders and stereo parities), through the selected backend
+
+    :returns: a dictionary relabeling the atom keys onto themselves for each
+        automorphism, including the identity
+    """
+    if _ISO_STATE['backend'] == 'igraph' and atoms(gra):
+        aut_dcts = _igraph.automorphisms(_igraph_graph(gra))
+    else:
+        aut_dcts = _networkx.automorphisms(_networkx_graph(gra))
+    return tuple(aut_dcts)
+
+
+def _isomorphism(gra1, gra2, sub=False):
+    """ (subgraph) isomorphism from `gra1` to `gra2`, through the selected
+    backend
+    """
+    if _ISO_STATE['backend'] == 'igraph' and atoms(gra1) and atoms(gra2):
+        igr1 = _igraph_graph(gra1)
+        igr2 = _igraph_graph(gra2)
+        iso_dct = (_igraph.subgraph_isomorphism(igr1, igr2) if sub else
+                   _igraph.isomorphism(igr1, igr2))
+    else:
+        nxg1 = _networkx_graph(gra1)
+        nxg2 = _networkx_graph(gra2)
+        iso_dct = (_networkx.subgraph_isomorphism(nxg1, nxg2) if sub
+                   else _networkx.isomorphism(nxg1, nxg2))
     return iso_dct
 
 
 def backbone_unique(gras):
     """ unique non-isomorphic graphs from a series
     """
-    gras = _unique(gras, equiv=backbone_isomorphic)
-    return gras
+    gras = tuple(gras)
+    imm_gras = tuple(map(immutable, gras))
+    idxs = _unique(range(len(gras)),
+                   equiv=lambda i, j: backbone_isomorphic(imm_gras[i],
+                                                          imm_gras[j]),
+                   key=lambda i: backbone_hash(imm_gras[i]))
+    return tuple(map(gras.__getitem__, idxs))
 
 
-def _unique(itms, equiv):
+def _unique(itms, equiv, key=None):
     """ unique items from a list, according to binary comparison `equiv`
+
+    :param key: an invariant of the items that is equal for equivalent
+        ones; if given, `equiv` is only called on items with matching keys
     """
     uniq_itms = []
+    uniq_itms_by_key = {}
     for itm in itms:
-        if not any(map(functools.partial(equiv, itm), uniq_itms)):
+        key_itms = uniq_itms_by_key.setdefault(
+            None if key is None else key(itm), [])
+        if not any(map(functools.partial(equiv, itm), key_itms)):
+            key_itms.append(itm)
             uniq_itms.append(itm)
 
     return tuple(uniq_itms)
 
 
+@memoized()
+def full_hash(gra):
+    """ an isomorphism invariant of the graph, for bucketing
+
+    Graphs that are fully isomorphic (matching symbols, implicit hydrogens,
+    bond orders and stereo parities) always have the same hash. Graphs with
+    different hashes are never isomorphic, but equal hashes don't imply
+    isomorphism.
+
+    The atom labels are refined by their neighbors' labels, as in the
+    Weisfeiler-Lehman test, until the number of distinct labels stops
+    growing.
+    """
+    atm_keys = atom_keys(gra)
+    atm_ngb_keys_dct = adjacency(gra).atom_neighbor_keys
+    bnd_lbl_dct = {bnd_key: hash(val) for bnd_key, val in bonds(gra).items()}
+
+    lbl_dct = {atm_key: hash(val) for atm_key, val in atoms(gra).items()}
+    nlbls = len(set(lbl_dct.values()))
+    for _ in range(len(atm_keys)):
+        lbl_dct = {
+            atm_key: hash((lbl_dct[atm_key], tuple(sorted(
+                hash((bnd_lbl_dct[frozenset({atm_key, ngb_key})],
+                      lbl_dct[ngb_key]))
+                for ngb_key in atm_ngb_keys_dct[atm_key]))))
+            for atm_key in atm_keys}
+        nlbls, prev_nlbls = len(set(lbl_dct.values())), nlbls
+        if nlbls == prev_nlbls:
+            break
+
+    return hash((len(atm_keys), len(bnd_lbl_dct),
+                 tuple(sorted(lbl_dct.values()))))
+
+
+def backbone_hash(gra):
+    """ an invariant of the graph backbone, for bucketing
+
+    Graphs that are backbone isomorphic always have the same hash (see
+    `full_hash`).
+    """
+    return full_hash(implicit(gra))
+
+
+@memoized()
+def canonical_keys(gra):
+    """ canonical atom keys, by atom
+
+    Isomorphic graphs (matching symbols, implicit hydrogens, bond orders and
+    stereo parities) relabeled with their canonical keys come out identical.
+    The labelling is computed with BLISS, through igraph.
+
+    :returns: a dictionary mapping each atom key onto its canonical key,
+        which run from 0 to the number of atoms minus one
+    """
+    can_key_dct = {}
+    if atoms(gra):
+        can_key_dct = _igraph.canonical_permutation(_igraph_graph(gra))
+    return can_key_dct
+
+
+def canonical(gra):
+    """ the graph, relabeled with its canonical atom keys
+    """
+    return relabel(gra, canonical_keys(gra))
+
+
+@memoized()
+def canonical_string(gra):
+    """ a compact identifier for the graph, unique up to isomorphism
+
+    Equal for two graphs exactly when their implicit-hydrogen forms are
+    isomorphic, and the same in every process, so it can serve as a
+    dictionary or database key for a species in place of an InChI.
+
+    format: the canonically ordered atoms, as symbol, implicit hydrogen
+    count and parity, then the bonds, as atom indices, order and parity, e.g.
+    `C3.C2+.O1/0-1:1.1-2:1` (parities: '' for None, '+' for True, '-' for
+    False)
+    """
+    gra = canonical(implicit(gra))
+
+    def _par(par):
+        return '' if par is None else '+' if par else '-'
+
+    atm_strs = ['{}{}{}'.format(sym, imp_hyd_vlc, _par(par))
+                for _, (sym, imp_hyd_vlc, par) in sorted(atoms(gra).items())]
+    bnd_strs = ['{}-{}:{}{}'.format(*sorted(bnd_key), ord_, _par(par))
+                for bnd_key, (ord_, par) in sorted(
+                    bonds(gra).items(), key=lambda x: sorted(x[0]))]
+    return '.'.join(atm_strs) + '/' + '.'.join(bnd_strs)
+
+
+def canonical_hash(gra):
+    """ a fixed-length hash of the canonical string, stable across processes
+    """
+    return hashlib.blake2b(canonical_string(gra).encode(),
+                           digest_size=16).hexdigest()
+
+
+@memoized()
+def _networkx_graph(gra):
+    """ networkx graph object, shared between comparisons of a `Graph`
+    """
+    return _networkx.from_graph(gra)
+
+
+@memoized()
+def _igraph_graph(gra):
+    """ igraph object, shared between comparisons of a `Graph`
+    """
+    return _igraph.from_graph(gra)
+
+
 # chemistry library
 VALENCE_DCT = {
     None: 0,
@@ -764,6 +939,7 @@ LONE_PAIR_COUNTS_DCT = {
 
 
 # # atom properties
+@memoized()
 def atom_element_valences(gra):
     """ element valences (# possible single bonds), by atom
     """
@@ -785,6 +961,7 @@ def atom_lone_pair_counts(gra):
     return atm_lpc_dct
 
 
+@memoized()
 def atom_bond_valences(gra, bond_order=True):
     """ bond count (bond valence), by atom
     """
@@ -793,13 +970,16 @@ def atom_bond_valences(gra, bond_order=True):
     if not bond_order:
         gra = without_bond_orders(gra)
 
-    atm_nbhs = dict_.values_by_key(atom_neighborhoods(gra), atm_keys)
-    atm_bnd_vlcs = [sum(bond_orders(nbh).values()) for nbh in atm_nbhs]
+    bnd_ord_dct = bond_orders(gra)
+    atm_bnd_keys_dct = adjacency(gra).atom_bond_keys
+    atm_bnd_vlcs = [sum(map(bnd_ord_dct.__getitem__, atm_bnd_keys_dct[key]))
+                    for key in atm_keys]
     atm_bnd_vlc_dct = dict_.transform_values(
         dict(zip(atm_keys, atm_bnd_vlcs)), int)
     return atm_bnd_vlc_dct
 
 
+@memoized()
 def atom_unsaturated_valences(gra, bond_order=True):
     """ unsaturated valences, by atom
 
@@ -826,6 +1006,7 @@ def unsaturated_atom_keys(gra):
 
 
 # # other properties
+@memoized()
 def maximum_spin_multiplicity(gra, bond_order=True):
     """ the highest possible spin multiplicity for this molecular graph
     """
@@ -1,5 +1,9 @@
 """ base molecular graph library
 """
+import copy
+import types
+import functools
+import collections
 import yaml
 from automol import dict_
 import automol.create.graph as _create
@@ -15,6 +19,120 @@ ATM_STE_PAR_POS = 2
 BND_ORD_POS = 0
 BND_STE_PAR_POS = 1
 
+ADJ_CACHE_SIZE = 1024
+
+Adjacency = collections.namedtuple(
+    'Adjacency', ('atom_neighbor_keys', 'atom_bond_keys',
+                  'bond_neighbor_keys'))
+
+
+class Graph(tuple):
+    """ hashable, immutable molecular graph with memoized derived properties
+
+    Unpacks, indexes and compares exactly like the standard
+    `(atm_dct, bnd_dct)` form, so it can be passed to any function that
+    takes a graph. The atom and bond dictionaries are read-only views.
+
+    Functions decorated with `memoized` keep their results on the graph
+    object, so derived properties (rings, resonances, explicit/implicit
+    forms, stereogenic keys, ...) are only computed once per graph. Graphs
+    derived this way are `Graph` objects too, carrying their own caches.
+    """
+
+    def __new__(cls, atm_dct, bnd_dct):
+        gra = super().__new__(cls, (types.MappingProxyType(dict(atm_dct)),
+                                    types.MappingProxyType(dict(bnd_dct))))
+        gra._cache = {}
+        gra._hash = None
+        return gra
+
+    def __hash__(self):
+        if self._hash is None:
+            atm_dct, bnd_dct = self
+            self._hash = hash((frozenset(atm_dct.items()),
+                               frozenset(bnd_dct.items())))
+        return self._hash
+
+    def __reduce__(self):
+        atm_dct, bnd_dct = self
+        return (Graph, (dict(atm_dct), dict(bnd_dct)))
+
+    def __repr__(self):
+        atm_dct, bnd_dct = self
+        return repr((dict(atm_dct), dict(bnd_dct)))
+
+    def cache_size(self):
+        """ the number of derived properties cached on this graph
+        """
+        return len(self._cache)
+
+    def cache_lookup(self, key):
+        """ a derived property cached on this graph
+
+        :returns: `(found, value)`; raises TypeError for unhashable keys
+        """
+        found = key in self._cache
+        return found, (self._cache[key] if found else None)
+
+    def cache_store(self, key, val):
+        """ cache a derived property on this graph
+        """
+        self._cache[key] = val
+
+
+def immutable(gra):
+    """ the graph as an immutable `Graph` object, which caches its derived
+    properties
+    """
+    if not isinstance(gra, Graph):
+        atm_dct, bnd_dct = gra
+        gra = Graph(atm_dct, bnd_dct)
+    return gra
+
+
+def immutable_sequence(gras):
+    """ a sequence of graphs as immutable `Graph` objects
+    """
+    return tuple(map(immutable, gras))
+
+
+def memoized(freeze=None):
+    """ memoize a graph function on `Graph` objects
+
+    Called on a `Graph`, the result is cached on the graph, by the remaining
+    arguments (unhashable arguments skip the cache). Called on a plain tuple
+    graph, the function runs as usual.
+
+    :param freeze: applied to the result before it is cached, such as
+        `immutable` for functions that return a graph
+    """
+
+    def _decorator(func):
+
+        @functools.wraps(func)
+        def _memoized(gra, *args, **kwargs):
+            if not isinstance(gra, Graph):
+                return func(gra, *args, **kwargs)
+
+            key = (func, args, tuple(sorted(kwargs.items())))
+            try:
+                found, val = gra.cache_lookup(key)
+            except TypeError:
+                return func(gra, *args, **kwargs)
+
+            if not found:
+                val = func(gra, *args, **kwargs)
+                val = val if freeze is None else freeze(val)
+                gra.cache_store(key, val)
+
+            # callers get their own copy of a mutable result
+            return (copy.copy(val) if isinstance(val, (dict, list, set)) else
+                    val)
+
+        return _memoized
+
+    return _decorator
+
 
 # getters
 def atoms(gra):
@@ -94,6 +212,38 @@ def bond_stereo_parities(sgr):
                                     BND_STE_PAR_POS)
 
 
+def adjacency(gra):
+    """ adjacency index: neighboring atoms and bonds, by atom and by bond
+
+    The index only depends on the atom and bond keys. It is built in one
+    pass over the bonds and memoized on those keys, so repeated neighbor
+    queries on the same graph share it.
+
+    :returns: an `Adjacency` of read-only dictionaries of frozensets
+    """
+    return _adjacency(atom_keys(gra), bond_keys(gra))
+
+
+@functools.lru_cache(maxsize=ADJ_CACHE_SIZE)
+def _adjacency(atm_keys, bnd_keys):
+    atm_ngb_keys_dct = {atm_key: set() for atm_key in atm_keys}
+    atm_bnd_keys_dct = {atm_key: set() for atm_key in atm_keys}
+    for bnd_key in bnd_keys:
+        for atm_key in bnd_key:
+            atm_ngb_keys_dct[atm_key].update(bnd_key - {atm_key})
+            atm_bnd_keys_dct[atm_key].add(bnd_key)
+
+    atm_ngb_keys_dct = dict_.transform_values(atm_ngb_keys_dct, frozenset)
+    atm_bnd_keys_dct = dict_.transform_values(atm_bnd_keys_dct, frozenset)
+    bnd_ngb_keys_dct = {
+        bnd_key: frozenset().union(
+            *map(atm_bnd_keys_dct.__getitem__, bnd_key)) - {bnd_key}
+        for bnd_key in bnd_keys}
+    return Adjacency(types.MappingProxyType(atm_ngb_keys_dct),
+                     types.MappingProxyType(atm_bnd_keys_dct),
+                     types.MappingProxyType(bnd_ngb_keys_dct))
+
+
 # setters
 def set_atom_implicit_hydrogen_valences(gra, atm_imp_hyd_vlc_dct):
     """ set atom implicit hydrogen valences
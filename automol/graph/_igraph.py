@@ -8,6 +8,9 @@ import automol
 import automol.create.graph
 from automol import dict_
 
+# edge colors are offset by this when edges are turned into vertices
+EDGE_COLOR_OFFSET = 100000
+
 
 def from_graph(gra):
     """ igraph object from a molecular graph
@@ -24,7 +27,11 @@ def from_graph(gra):
     atm_colors = list(itertools.starmap(_encode_vertex_attributes, atm_vals))
     bnd_colors = list(itertools.starmap(_encode_edge_attributes, bnd_vals))
 
-    igr = igraph.Graph(bnd_labels)
+    # vertices are numbered by position, in case the keys have gaps
+    idx_dct = {atm_key: idx for idx, atm_key in enumerate(atm_keys)}
+    edges = [tuple(map(idx_dct.__getitem__, bnd_label))
+             for bnd_label in bnd_labels]
+    igr = igraph.Graph(n=len(atm_keys), edges=edges)
 
     igr.vs['label'] = atm_labels
     igr.es['label'] = bnd_labels
@@ -64,7 +71,7 @@ def _encode_vertex_attributes(sym, imp_hyd_vlc, par):
         implicit hydrogen valence   <=> tens place
         parity                      <=> ones place (None->0, False->1, True->2)
     """
-    id3 = pt.to_Z(sym)
+    id3 = 0 if sym == 'X' else pt.to_Z(sym)
     id2 = imp_hyd_vlc
     id1 = 0 if par is None else 1 + int(par)
 
@@ -100,7 +107,7 @@ def _decode_vertex_attributes(color):
     color -= id2 * 10
     id1 = color // 1
 
-    sym = pt.to_E(id3)
+    sym = 'X' if id3 == 0 else pt.to_E(id3)
     imp_hyd_vlc = id2
     assert id1 in (0, 1, 2)
     par = None if id1 == 0 else bool(id1 - 1)
@@ -133,18 +140,87 @@ def automorphisms(igr):
     atm_colors = igr.vs['color']
     bnd_colors = igr.es['color']
     auts = igr.get_automorphisms_vf2(color=atm_colors, edge_color=bnd_colors)
-    aut_dcts = [dict(zip(atm_keys, aut)) for aut in auts]
+    aut_dcts = [dict(zip(atm_keys, map(atm_keys.__getitem__, aut)))
+                for aut in auts]
     return aut_dcts
 
 
 def canonical_permutation(igr):
-    """ get the list of automorphisms for an igraph object
+    """ get the canonical permutation of the atoms for an igraph object
+
+    The igraph/BLISS function doesn't consider edge colors, so each bond is
+    split by an extra vertex carrying the bond color, offset past the atom
+    colors. The atoms are then numbered in the order BLISS puts them.
 
-    (currently does not consider bond stereo, because the igraph/BLISS function
-    doesn't consider edge colors)
+    :returns: a dictionary mapping atom keys onto canonical indices
     """
     atm_keys = igr.vs['label']
-    atm_colors = igr.vs['color']
-    perm = igr.canonical_permutation(color=atm_colors)
-    perm_dct = dict(zip(atm_keys, perm))
+    natms = igr.vcount()
+
+    edges = igr.get_edgelist()
+    sub_edges = []
+    for bnd_idx, (idx1, idx2) in enumerate(edges):
+        sub_edges.extend([(idx1, natms + bnd_idx), (natms + bnd_idx, idx2)])
+    sub_colors = igr.vs['color'] + [EDGE_COLOR_OFFSET + color
+                                    for color in igr.es['color']]
+    sub_igr = igraph.Graph(n=natms + len(edges), edges=sub_edges)
+
+    perm = sub_igr.canonical_permutation(color=sub_colors)[:natms]
+    perm_dct = {atm_keys[idx]: can_idx
+                for can_idx, idx in enumerate(sorted(range(natms),
+                                                     key=perm.__getitem__))}
     return perm_dct
+
+
+def isomorphism(igr1, igr2):
+    """ graph isomorphism, through the igraph VF2 implementation
+
+    :returns: a dictionary mapping the atom keys of the first graph onto
+        those of the second, or None if they aren't isomorphic
+    """
+    iso_dct = None
+    if (igr1.vcount() == igr2.vcount() and igr1.ecount() == igr2.ecount()
+            and sorted(igr1.vs['color']) == sorted(igr2.vs['color'])):
+        iso, map12, _ = igr1.isomorphic_vf2(
+            igr2, color1=igr1.vs['color'], color2=igr2.vs['color'],
+            edge_color1=igr1.es['color'], edge_color2=igr2.es['color'],
+            return_mapping_12=True)
+        if iso:
+            atm_keys1 = igr1.vs['label']
+            atm_keys2 = igr2.vs['label']
+            iso_dct = {atm_keys1[idx1]: atm_keys2[idx2]
+                       for idx1, idx2 in enumerate(map12)}
+    return iso_dct
+
+
+def subgraph_isomorphism(igr1, igr2):
+    """ subgraph isomorphism -- an induced subgraph of the first graph is
+    isomorphic to the second
+
+    :returns: a dictionary mapping atom keys of the first graph onto those of
+        the second, or None if there is no such subgraph
+    """
+    found = []
+
+    def _check_induced(igr1_, igr2_, map12, map21):
+        # VF2 finds edge-preserving matches; keep the first one that adds no
+        # edges between the matched atoms
+        nedges = sum(igr1_.are_connected(idx1, idx2)
+                     for idx1, idx2 in itertools.combinations(map21, 2))
+        if nedges == igr2_.ecount():
+            found.append(map12)
+        return not found
+
+    igr1.subisomorphic_vf2(
+        igr2, color1=igr1.vs['color'], color2=igr2.vs['color'],
+        edge_color1=igr1.es['color'], edge_color2=igr2.es['color'],
+        callback=_check_induced)
+
+    iso_dct = None
+    if found:
+        map12 = found[0]
+        atm_keys1 = igr1.vs['label']
+        atm_keys2 = igr2.vs['label']
+        iso_dct = {atm_keys1[idx1]: atm_keys2[idx2]
+                   for idx1, idx2 in enumerate(map12) if idx2 >= 0}
+    return iso_dct
@@ -1,6 +1,8 @@
 """ networkx interface
 """
 import operator
+import itertools
+import collections
 import networkx
 from automol.graph._graph_base import atom_keys
 from automol.graph._graph_base import bond_keys
@@ -71,6 +73,37 @@ def subgraph_isomorphism(nxg1, nxg2):
     return iso_dct
 
 
+def automorphisms(nxg):
+    """ the automorphisms of a networkx graph, as dictionaries
+    """
+    matcher = networkx.algorithms.isomorphism.GraphMatcher(
+        nxg, nxg, node_match=operator.eq, edge_match=operator.eq)
+    return [dict(aut) for aut in matcher.isomorphisms_iter()]
+
+
+def maximum_b_matching(atm_cap_dct, bnd_keys):
+    """ a maximum b-matching: the largest number of bonds, counted with
+    multiplicity, such that no atom is in more of them than its capacity
+
+    (solved as a maximum matching on a graph where each atom is split into as
+    many copies as its capacity)
+
+    :param atm_cap_dct: capacities, by atom
+    :param bnd_keys: the bonds that can be matched
+    :returns: multiplicities of the matched bonds, by bond
+    """
+    nxg = networkx.Graph()
+    for key1, key2 in bnd_keys:
+        nxg.add_edges_from(itertools.product(
+            [(key1, idx) for idx in range(atm_cap_dct[key1])],
+            [(key2, idx) for idx in range(atm_cap_dct[key2])]))
+
+    mat = networkx.max_weight_matching(nxg, maxcardinality=True)
+    bnd_mult_dct = dict(collections.Counter(
+        frozenset({node1[0], node2[0]}) for node1, node2 in mat))
+    return bnd_mult_dct
+
+
 if __name__ == '__main__':
     GRA = (
         {0: ('C', 3, None), 1: ('C', 2, None), 2: ('C', 3, None),
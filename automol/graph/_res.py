@@ -1,8 +1,8 @@
 """ resonance graph library
 """
 
-import itertools
 import functools
+import collections
 import numpy
 from automol import dict_
 from automol.graph._graph import atom_keys
@@ -16,12 +16,16 @@ from automol.graph._graph import atom_neighbor_keys
 from automol.graph._graph import atom_unsaturated_valences
 from automol.graph._graph import atom_bond_valences
 from automol.graph._graph import atom_lone_pair_counts
-from automol.graph._graph import maximum_spin_multiplicity
 from automol.graph._graph import explicit
 from automol.graph._graph import atom_explicit_hydrogen_valences
 from automol.graph._graph import atoms
 from automol.graph._graph import atom_groups
 from automol.graph._graph import full_isomorphism
+from automol.graph._graph_base import immutable
+from automol.graph._graph_base import immutable_sequence
+from automol.graph._graph_base import memoized
+from automol import _lazy
+_networkx = _lazy.module('automol.graph._networkx')
 
 
 # atom properties
@@ -42,6 +46,7 @@ def atom_hybridizations(rgr):
     return atm_hyb_dct
 
 
+@memoized()
 def resonance_dominant_atom_hybridizations(rgr):
     """ resonance-dominant atom hybridizations, by atom
     """
@@ -145,6 +150,7 @@ def nonresonant_radical_atom_keys(rgr):
     return atm_rad_keys
 
 
+@memoized()
 def resonance_dominant_radical_atom_keys(rgr):
     """ resonance-dominant radical atom keys
 
@@ -221,6 +227,7 @@ def radical_dissociation_prods(gra, pgra1):
 
 
 # bond properties
+@memoized()
 def resonance_dominant_bond_orders(rgr):
     """ resonance-dominant bond orders, by bond
     """
@@ -261,20 +268,38 @@ def resonance_avg_bond_orders(rgr):
 
 
 # transformations
+@memoized(freeze=immutable)
 def dominant_resonance(rgr):
     """ *a* dominant (minimum spin/maximum pi) resonance graph
     """
-    return next(iter(dominant_resonances(rgr)))
+    return next(iter_subresonances(without_bond_orders(rgr), dominant=True))
 
 
+@memoized(freeze=immutable_sequence)
 def dominant_resonances(rgr):
     """ all dominant (minimum spin/maximum pi) resonance graphs
     """
-    rgrs = resonances(rgr)
-    mult_min = min(map(maximum_spin_multiplicity, rgrs))
-    dom_rgrs = tuple(
-        rgr for rgr in rgrs if maximum_spin_multiplicity(rgr) == mult_min)
-    return dom_rgrs
+    return tuple(
+        iter_subresonances(without_bond_orders(rgr), dominant=True))
+
+
+@memoized(freeze=immutable)
+def kekule(rgr):
+    """ a dominant (minimum spin/maximum pi) resonance graph, read directly
+    off of a maximum matching of the unsaturated atoms
+
+    Unlike `dominant_resonance`, this doesn't search through resonances at
+    all, so it is the cheaper choice when any dominant resonance will do.
+    """
+    rgr = without_bond_orders(rgr)
+    bnd_cap_dct = dict_.by_value(_bond_capacities(rgr), lambda x: x > 0)
+    if not bnd_cap_dct:
+        return rgr
+
+    atm_unsat_vlc_dct = atom_unsaturated_valences(rgr)
+    bnd_ord_inc_dct = _networkx.maximum_b_matching(
+        atm_unsat_vlc_dct, bnd_cap_dct.keys())
+    return _add_pi_bonds(rgr, bnd_ord_inc_dct)
 
 
 def resonances(rgr):
@@ -286,38 +311,84 @@ def resonances(rgr):
 def subresonances(rgr):
     """ this connected graph and its lower-spin (more pi-bonded) resonances
     """
+    return tuple(iter_subresonances(rgr))
+
+
+def iter_subresonances(rgr, dominant=False):
+    """ generate this connected graph and its lower-spin (more pi-bonded)
+    resonances, in the same order as `subresonances`
+
+    :param dominant: only generate the ones with the most pi bonds?
+    """
     # get the bond capacities (room for increasing bond order), filtering out
     # the negative ones to avoid complications with hypervalent atoms in TSs
     bnd_cap_dct = dict_.by_value(_bond_capacities(rgr), lambda x: x > 0)
 
-    ret_rgrs = []
-    if bnd_cap_dct:
-        bnd_keys, bnd_caps = zip(*bnd_cap_dct.items())
-        atm_keys = list(functools.reduce(frozenset.union, bnd_keys))
-
-        # Loop over all possible combinations of bond order increments (amounts
-        # by which to increase the bond order), filtering out combinations that
-        # exceed the valences of the atoms involved.
-        # (Note that we are only testing the bonds with available pi electrons,
-        # so this is compatible with having hypervalent atoms elsewhere in the
-        # molecule)
-        bnd_ord_inc_ranges = [range(bnd_cap+1) for bnd_cap in bnd_caps]
-        for bnd_ord_incs in itertools.product(*bnd_ord_inc_ranges):
-            bnd_ord_inc_dct = dict(zip(bnd_keys, bnd_ord_incs))
-            ret_rgr = _add_pi_bonds(rgr, bnd_ord_inc_dct)
-
-            atm_unsat_vlcs = dict_.values_by_key(
-                atom_unsaturated_valences(ret_rgr), atm_keys)
-
-            if not any(atm_unsat_vlc < 0 for atm_unsat_vlc in atm_unsat_vlcs):
-                ret_rgrs.append(ret_rgr)
-
-    if not ret_rgrs:
-        ret_rgrs = (rgr,)
+    if not bnd_cap_dct:
+        yield rgr
     else:
-        ret_rgrs = tuple(ret_rgrs)
+        for bnd_ord_inc_dct in _pi_bond_increments(rgr, bnd_cap_dct,
+                                                   dominant=dominant):
+            yield _add_pi_bonds(rgr, bnd_ord_inc_dct)
+
 
-    return ret_rgrs
+def _pi_bond_increments(rgr, bnd_cap_dct, dominant=False):
+    """ generate the valid bond order increments for these bonds
+
+    Bonds are assigned one at a time, and each one is only offered the
+    increments that its atoms have unsaturated valences left for, so there is
+    never an invalid assignment to filter out. (Note that we are only testing
+    the bonds with available pi electrons, so this is compatible with having
+    hypervalent atoms elsewhere in the molecule)
+
+    For dominant assignments, the number of pi bonds to reach comes from a
+    maximum matching, and branches that can no longer reach it are cut.
+    """
+    bnd_keys, bnd_caps = zip(*bnd_cap_dct.items())
+    atm_unsat_vlc_dct = atom_unsaturated_valences(rgr)
+    atm_rem_dct = {atm_key: atm_unsat_vlc_dct[atm_key]
+                   for atm_key in functools.reduce(frozenset.union, bnd_keys)}
+    nbnds = len(bnd_keys)
+
+    target = None
+    if dominant:
+        target = sum(_networkx.maximum_b_matching(
+            atm_rem_dct, bnd_keys).values())
+
+    def _bound(idx):
+        """ an upper bound on the pi bonds left to add, from bond `idx` on
+        """
+        bnd_bound = 0
+        atm_cap_dct = collections.defaultdict(int)
+        for (key1, key2), cap in zip(bnd_keys[idx:], bnd_caps[idx:]):
+            cap = min(cap, atm_rem_dct[key1], atm_rem_dct[key2])
+            bnd_bound += cap
+            atm_cap_dct[key1] += cap
+            atm_cap_dct[key2] += cap
+        atm_bound = sum(min(cap, atm_rem_dct[atm_key])
+                        for atm_key, cap in atm_cap_dct.items()) // 2
+        return min(bnd_bound, atm_bound)
+
+    bnd_ord_incs = [0] * nbnds
+
+    def _assign(idx, count):
+        if idx == nbnds:
+            if target is None or count == target:
+                yield dict(zip(bnd_keys, bnd_ord_incs))
+        elif target is None or count + _bound(idx) >= target:
+            key1, key2 = bnd_keys[idx]
+            max_inc = min(bnd_caps[idx],
+                          atm_rem_dct[key1], atm_rem_dct[key2])
+            for inc in range(max_inc+1):
+                bnd_ord_incs[idx] = inc
+                atm_rem_dct[key1] -= inc
+                atm_rem_dct[key2] -= inc
+                yield from _assign(idx+1, count+inc)
+                atm_rem_dct[key1] += inc
+                atm_rem_dct[key2] += inc
+            bnd_ord_incs[idx] = 0
+
+    yield from _assign(0, 0)
 
 
 def _bond_capacities(rgr):
@@ -10,7 +10,9 @@ from automol.graph._graph import atom_keys
 from automol.graph._graph import bond_keys
 from automol.graph._graph import atom_bond_keys
 from automol.graph._graph import bond_induced_subgraph
-from automol.graph import _networkx
+from automol.graph._graph_base import memoized
+from automol import _lazy
+_networkx = _lazy.module('automol.graph._networkx')
 
 
 def rings(gra):
@@ -21,6 +23,7 @@ def rings(gra):
     return tuple(sorted(gras, key=frozen))
 
 
+@memoized()
 def rings_atom_keys(gra):
     """ atom keys for each ring in the graph sorted by connectivity (minimal basis)
     """
@@ -47,6 +50,7 @@ def _sorted_ring_atom_keys(rng_bnd_keys):
     return rng_atm_keys
 
 
+@memoized()
 def rings_bond_keys(gra):
     """ bond keys for each ring in the graph (minimal basis)
     """
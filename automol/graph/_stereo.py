@@ -22,6 +22,10 @@ from automol.graph._graph import explicit
 from automol.graph._graph import implicit
 from automol.graph._graph import backbone_keys
 from automol.graph._graph import explicit_hydrogen_keys
+from automol.graph._graph import automorphisms
+from automol.graph._graph import backbone_hash
+from automol.graph._graph import backbone_isomorphic
+from automol.graph._graph_base import memoized
 
 
 def has_stereo(gra):
@@ -46,6 +50,7 @@ def bond_stereo_keys(sgr):
     return bnd_ste_keys
 
 
+@memoized()
 def stereo_priority_vector(gra, atm_key, atm_ngb_key):
     """ generates a sortable one-to-one representation of the branch extending
     from `atm_key` through its bonded neighbor `atm_ngb_key`
@@ -101,6 +106,7 @@ def _replace_nones_with_negative_infinity(seq):
     return [-numpy.inf if val is None else val for val in seq]
 
 
+@memoized()
 def stereogenic_atom_keys(gra):
     """ (unassigned) stereogenic atoms in this graph
     """
@@ -122,6 +128,7 @@ def stereogenic_atom_keys(gra):
     return ste_gen_atm_keys
 
 
+@memoized()
 def stereogenic_bond_keys(gra):
     """ (unassigned) stereogenic bonds in this graph
     """
@@ -170,39 +177,36 @@ def stereogenic_bond_keys(gra):
 def stereomers(gra):
     """ all stereomers, ignoring this graph's assignments
     """
-    bool_vals = (False, True)
+    return tuple(sorted(iter_stereomers(gra), key=frozen))
 
-    def _expand_atom_stereo(sgr):
-        atm_ste_keys = stereogenic_atom_keys(sgr)
-        nste_atms = len(atm_ste_keys)
-        sgrs = [set_atom_stereo_parities(sgr, dict(zip(atm_ste_keys,
-                                                       atm_ste_par_vals)))
-                for atm_ste_par_vals
-                in itertools.product(bool_vals, repeat=nste_atms)]
-        return sgrs
 
-    def _expand_bond_stereo(sgr):
-        bnd_ste_keys = stereogenic_bond_keys(sgr)
-        nste_bnds = len(bnd_ste_keys)
-        sgrs = [set_bond_stereo_parities(sgr, dict(zip(bnd_ste_keys,
-                                                       bnd_ste_par_vals)))
-                for bnd_ste_par_vals
-                in itertools.product(bool_vals, repeat=nste_bnds)]
-        return sgrs
+def substereomers(gra):
+    """ all stereomers compatible with this graph's assignments
+    """
+    return tuple(sorted(iter_substereomers(gra), key=frozen))
 
-    last_sgrs = []
-    sgrs = [without_stereo_parities(gra)]
 
-    while sgrs != last_sgrs:
-        last_sgrs = sgrs
-        sgrs = list(itertools.chain(*map(_expand_atom_stereo, sgrs)))
-        sgrs = list(itertools.chain(*map(_expand_bond_stereo, sgrs)))
+def iter_stereomers(gra, unique=False):
+    """ generate the stereomers, ignoring this graph's assignments
 
-    return tuple(sorted(sgrs, key=frozen))
+    :param unique: skip stereomers that are isomorphic to one already
+        generated?
+    """
+    return iter_substereomers(without_stereo_parities(gra), unique=unique)
 
 
-def substereomers(gra):
-    """ all stereomers compatible with this graph's assignments
+def iter_substereomers(gra, unique=False):
+    """ generate the stereomers compatible with this graph's assignments
+
+    The stereogenic atoms, then the stereogenic bonds, are assigned one at a
+    time, and this is repeated until no unassigned stereogenic centers are
+    left. Centers that this graph already assigns are only given their
+    assigned parity. Since nothing is enumerated up front, the caller can
+    stop as soon as it has what it needs.
+
+    :param unique: skip stereomers that are isomorphic to one already
+        generated? (assignments that a graph automorphism maps onto an
+        earlier one are pruned as they come up)
     """
     _assigned = functools.partial(
         dict_.filter_by_value, func=lambda x: x is not None)
@@ -219,8 +223,118 @@ def substereomers(gra):
                               set(bnd_ste_par_dct.items()))
         return _compat_atm_assgns and _compat_bnd_assgns
 
-    sgrs = tuple(filter(_is_compatible, stereomers(gra)))
-    return sgrs
+    def _expand_stereo(sgr):
+        atm_ste_keys = sorted(stereogenic_atom_keys(sgr))
+        for atm_sgr in _assign_stereo(sgr, atm_ste_keys,
+                                      known_atm_ste_par_dct,
+                                      set_atom_stereo_parities,
+                                      perms=_permutations(sgr, atm_ste_keys)):
+            bnd_ste_keys = sorted(stereogenic_bond_keys(atm_sgr), key=sorted)
+            for bnd_sgr in _assign_stereo(atm_sgr, bnd_ste_keys,
+                                          known_bnd_ste_par_dct,
+                                          set_bond_stereo_parities,
+                                          perms=_permutations(atm_sgr,
+                                                              bnd_ste_keys)):
+                if atm_ste_keys or bnd_ste_keys:
+                    yield from _expand_stereo(bnd_sgr)
+                else:
+                    yield bnd_sgr
+
+    def _permutations(sgr, ste_keys):
+        perms = ()
+        if unique and ste_keys:
+            perms = _stereo_key_permutations(
+                sgr, ste_keys, known_atm_ste_par_dct, known_bnd_ste_par_dct)
+        return perms
+
+    seen_sgrs_dct = {}
+    for sgr in _expand_stereo(without_stereo_parities(gra)):
+        if not _is_compatible(sgr):
+            continue
+
+        if unique:
+            seen_sgrs = seen_sgrs_dct.setdefault(backbone_hash(sgr), [])
+            if any(backbone_isomorphic(sgr, seen_sgr)
+                   for seen_sgr in seen_sgrs):
+                continue
+            seen_sgrs.append(sgr)
+
+        yield sgr
+
+
+def _assign_stereo(sgr, ste_keys, known_ste_par_dct, set_ste_pars_,
+                   perms=()):
+    """ generate the parity assignments for these stereo keys
+
+    Keys with a known parity only get that one. An assignment is dropped as
+    soon as one of the permutations `perms` that maps the keys assigned so
+    far onto themselves takes it to an earlier one, so only the first of each
+    set of assignments related by them is generated.
+
+    :param set_ste_pars_: the function setting the parities, by key
+    :param perms: permutations of the key positions (see
+        `_stereo_key_permutations`)
+    """
+    nkeys = len(ste_keys)
+    ste_pars_lst = [(known_ste_par_dct[key],) if key in known_ste_par_dct
+                    else (False, True) for key in ste_keys]
+
+    # the permutations that map the first `idx` keys onto themselves
+    stab_perms_lst = [
+        [perm for perm in perms if set(perm[:idx]) == set(range(idx))]
+        for idx in range(nkeys+1)]
+
+    ste_pars = [None] * nkeys
+
+    def _is_first(idx):
+        for perm in stab_perms_lst[idx]:
+            img_ste_pars = [None] * idx
+            for key_idx in range(idx):
+                img_ste_pars[perm[key_idx]] = ste_pars[key_idx]
+            if img_ste_pars < ste_pars[:idx]:
+                return False
+        return True
+
+    def _assign(idx):
+        if idx == nkeys:
+            yield set_ste_pars_(sgr, dict(zip(ste_keys, ste_pars)))
+        else:
+            for ste_par in ste_pars_lst[idx]:
+                ste_pars[idx] = ste_par
+                if _is_first(idx+1):
+                    yield from _assign(idx+1)
+
+    yield from _assign(0)
+
+
+def _stereo_key_permutations(sgr, ste_keys, known_atm_ste_par_dct,
+                             known_bnd_ste_par_dct):
+    """ the automorphisms of this graph, as permutations of the positions of
+    these stereo keys
+
+    The identity is left out, and so is any automorphism that doesn't map the
+    known parities onto themselves, since pruning with it could drop the only
+    compatible member of a set of equivalent assignments.
+    """
+    key_idx_dct = {key: idx for idx, key in enumerate(ste_keys)}
+
+    perms = []
+    for aut_dct in automorphisms(implicit(sgr)):
+        def _image(key, aut_dct=aut_dct):
+            return (frozenset(map(aut_dct.__getitem__, key))
+                    if isinstance(key, frozenset) else aut_dct[key])
+
+        img_keys = list(map(_image, ste_keys))
+        if (all(img_key in key_idx_dct for img_key in img_keys) and
+                all(known_atm_ste_par_dct.get(_image(key)) == par
+                    for key, par in known_atm_ste_par_dct.items()) and
+                all(known_bnd_ste_par_dct.get(_image(key)) == par
+                    for key, par in known_bnd_ste_par_dct.items())):
+            perm = tuple(map(key_idx_dct.__getitem__, img_keys))
+            if perm != tuple(range(len(ste_keys))):
+                perms.append(perm)
+
+    return perms
 
 
 def stereo_sorted_atom_neighbor_keys(gra, atm_key, atm_ngb_keys):
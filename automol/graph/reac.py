@@ -42,6 +42,10 @@ from automol.graph._graph import atom_neighbor_keys
 from automol.graph._res import resonance_dominant_radical_atom_keys
 from automol.graph._func_group import chem_unique_atoms_of_type
 from automol.graph._func_group import bonds_of_order
+from automol.graph._graph_base import immutable
+from automol.graph._graph_base import immutable_sequence
+from automol.graph._graph import _unique
+from automol.graph._graph import full_hash
 
 
 def is_valid_reaction(rct_gras, prd_gras):
@@ -520,6 +524,9 @@ def classify_simple(rct_gras, prd_gras):
 def classify(rct_gras, prd_gras):
     """ classify a reaction
     """
+    # share derived properties between the reaction finders
+    rct_gras = immutable_sequence(rct_gras)
+    prd_gras = immutable_sequence(prd_gras)
 
     # check whether this is a valid reaction
     rct_fmls = list(map(automol.formula.string,
@@ -725,30 +732,15 @@ def _prod_group_loss(gra, grp='H'):
 def _unique_gras(gra_lst):
     """ Determine all of the unique gras deals with gras with multiple components
     """
-
-    uni_gras = tuple()
-    if gra_lst:
-
-        # Initialize list with first element
-        uni_gras += (gra_lst[0],)
-
-        # Test if the del_gra is isomorphic to any of the uni_del_gras
-        for gra in gra_lst[1:]:
-            new_uni = True
-            for uni_gra in uni_gras:
-                if len(gra) == 1:
-                    isodct = full_isomorphism(gra, uni_gra)
-                else:
-                    isodct = full_isomorphism(union(*gra), union(*uni_gra))
-                if isodct:
-                    new_uni = False
-                    break
-
-            # Add graph and idx to lst if del gra is unique
-            if new_uni:
-                uni_gras += (gra,)
-
-    return uni_gras
+    gra_lst = tuple(gra_lst)
+
+    # compare the union of the components, bucketed by an isomorphism hash
+    uni_gras = tuple(map(immutable, map(union_from_sequence, gra_lst)))
+    idxs = _unique(range(len(gra_lst)),
+                   equiv=lambda i, j: bool(full_isomorphism(uni_gras[i],
+                                                            uni_gras[j])),
+                   key=lambda i: full_hash(uni_gras[i]))
+    return tuple(map(gra_lst.__getitem__, idxs))
 
 
 if __name__ == '__main__':
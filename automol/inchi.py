@@ -1,5 +1,6 @@
 """ InChI chemical identifiers
 """
+import types
 import itertools
 import functools
 import numpy
@@ -14,6 +15,9 @@ NONSLASHES = app.one_or_more(NONSLASH)
 SLASH = app.escape('/')
 SLASH_OR_START = app.one_of_these([SLASH, app.STRING_START])
 SLASH_OR_END = app.one_of_these([SLASH, app.STRING_END])
+PARSE_CACHE_SIZE = 65536
+STANDARD_PREFIX = 'InChI=1S'
+NONSTANDARD_PREFIX = 'InChI=1'
 
 
 # "constructor"
@@ -27,46 +31,170 @@ def from_data(fml_slyr, main_dct=None, char_dct=None, ste_dct=None,
         isotope_sublayer_dct=iso_dct)
 
 
+# parsing
+class ParsedInchi():
+    """ an InChI string, parsed into its layers once
+
+    Instances are immutable and interned by `parse`, so that every function
+    below parses each string only the first time it sees it; after that, each
+    layer is an attribute lookup. The sublayer dictionaries are read-only.
+    """
+    __slots__ = ('_ich', '_ver', '_fml_slyr', '_main_dct', '_char_dct',
+                 '_ste_dct', '_iso_dct', '_layer_key', '_ichs')
+
+    def __init__(self, ich):
+        ich = str(ich)
+        self._ich = ich
+        self._ver = apf.first_capture(app.capturing(_version_pattern()), ich)
+        self._fml_slyr = apf.first_capture(
+            _version_pattern() + SLASH +
+            app.capturing(_formula_sublayer_pattern()), ich)
+        self._main_dct = types.MappingProxyType(_sublayers(_main_layer(ich)))
+        self._char_dct = types.MappingProxyType(
+            _sublayers(_charge_layer(ich)))
+        self._ste_dct = types.MappingProxyType(
+            _sublayers(_stereo_layer(ich)))
+        self._iso_dct = types.MappingProxyType(
+            _sublayers(_isotope_layer(ich)))
+        self._layer_key = (self._fml_slyr,) + tuple(
+            tuple(sorted(dct.items())) for dct in
+            (self._main_dct, self._char_dct, self._ste_dct, self._iso_dct))
+        self._ichs = None
+
+    @property
+    def string(self):
+        """ the InChI string
+        """
+        return self._ich
+
+    @property
+    def version(self):
+        """ version
+        """
+        return self._ver
+
+    @property
+    def formula_sublayer(self):
+        """ formula sublayer
+        """
+        return self._fml_slyr
+
+    @property
+    def main_sublayers(self):
+        """ main sublayers, by prefix
+        """
+        return self._main_dct
+
+    @property
+    def charge_sublayers(self):
+        """ charge sublayers, by prefix
+        """
+        return self._char_dct
+
+    @property
+    def stereo_sublayers(self):
+        """ stereo sublayers, by prefix
+        """
+        return self._ste_dct
+
+    @property
+    def isotope_sublayers(self):
+        """ isotope sublayers, by prefix
+        """
+        return self._iso_dct
+
+    @property
+    def layer_key(self):
+        """ the layers up to the isotope layer, as a hashable key
+
+        (two InChIs are equivalent if their layer keys are equal)
+        """
+        return self._layer_key
+
+    @property
+    def has_stereo(self):
+        """ does this inchi have stereo information?
+        """
+        return bool(self._ste_dct or
+                    any(pfx in self._iso_dct
+                        for pfx in automol.create.inchi.STE_PFXS))
+
+    def split(self):
+        """ split into inchis for each component, computed once
+        """
+        if self._ichs is None:
+            self._ichs = _split(self)
+        return self._ichs
+
+    def __eq__(self, other):
+        if isinstance(other, ParsedInchi):
+            return self._ich == other.string
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._ich)
+
+    def __str__(self):
+        return self._ich
+
+    def __repr__(self):
+        return 'ParsedInchi({})'.format(repr(self._ich))
+
+
+def parse(ich):
+    """ parse an inchi string into its layers
+
+    Parsed InChIs are interned, so parsing the same string again is a cache
+    lookup.
+
+    :param ich: an InChI string, or an already parsed InChI
+    :rtype: ParsedInchi
+    """
+    if isinstance(ich, ParsedInchi):
+        return ich
+    return _parse(str(ich))
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(ich):
+    return ParsedInchi(ich)
+
+
 # getters
 def version(ich):
     """ version
     """
-    ptt = app.capturing(_version_pattern())
-    ver = apf.first_capture(ptt, ich)
-    return ver
+    return parse(ich).version
 
 
 def formula_sublayer(ich):
     """ formula sublayer
     """
-    ptt = (_version_pattern() +
-           SLASH + app.capturing(_formula_sublayer_pattern()))
-    lyr = apf.first_capture(ptt, ich)
-    return lyr
+    return parse(ich).formula_sublayer
 
 
 def main_sublayers(ich):
     """ main sublayers, by prefix
     """
-    return _sublayers(_main_layer(ich))
+    return dict(parse(ich).main_sublayers)
 
 
 def charge_sublayers(ich):
     """ charge sublayers, by prefix
     """
-    return _sublayers(_charge_layer(ich))
+    return dict(parse(ich).charge_sublayers)
 
 
 def stereo_sublayers(ich):
     """ stereo sublayers, by prefix
     """
-    return _sublayers(_stereo_layer(ich))
+    return dict(parse(ich).stereo_sublayers)
 
 
 def isotope_sublayers(ich):
     """ isotope sublayers, by prefix
     """
-    return _sublayers(_isotope_layer(ich))
+    return dict(parse(ich).isotope_sublayers)
 
 
 # setters
@@ -92,16 +220,23 @@ def standard_form(ich, remove_stereo=False):
 
     ich = from_data(fml_slyr, main_dct=main_dct, char_dct=char_dct,
                     ste_dct=ste_dct, iso_dct=iso_dct)
-    return recalculate(ich)
+
+    # if these layers spell out a standard inchi that has already come out of
+    # a recalculation, it is its own standard form and RDKit can be skipped
+    # (only strings RDKit has produced are trusted, so the input is still
+    # validated the first time it is seen)
+    std_ich = STANDARD_PREFIX + ich[len(NONSTANDARD_PREFIX):]
+    if automol.convert.inchi.recalculate.peek(std_ich) == std_ich:
+        ich = std_ich
+    else:
+        ich = recalculate(ich)
+    return ich
 
 
 def has_stereo(ich):
     """ does this inchi have stereo information?
     """
-    ste_dct = stereo_sublayers(ich)
-    iso_dct = isotope_sublayers(ich)
-    return bool(ste_dct or
-                any(pfx in iso_dct for pfx in automol.create.inchi.STE_PFXS))
+    return parse(ich).has_stereo
 
 
 def has_multiple_components(ich):
@@ -135,11 +270,7 @@ def is_chiral(ich):
 def equivalent(ich1, ich2):
     """ are these inchis equivalent? (only considers up to the isotope layer
     """
-    return (formula_sublayer(ich1) == formula_sublayer(ich2) and
-            main_sublayers(ich1) == main_sublayers(ich2) and
-            charge_sublayers(ich1) == charge_sublayers(ich2) and
-            stereo_sublayers(ich1) == stereo_sublayers(ich2) and
-            isotope_sublayers(ich1) == isotope_sublayers(ich2))
+    return parse(ich1).layer_key == parse(ich2).layer_key
 
 
 def same_connectivity(ich1, ich2):
@@ -226,6 +357,10 @@ def split(ich):
     (fix this for /s [which should be removed in split/join operations] and /m,
     which is joined as /m0110..  with no separators)
     """
+    return parse(ich).split()
+
+
+def _split(ich):
     fml_slyr = formula_sublayer(ich)
     main_dct = main_sublayers(ich)
     char_dct = charge_sublayers(ich)
@@ -295,10 +430,13 @@ def recalculate(ich, force_stereo=False):
     return automol.convert.inchi.recalculate(ich, force_stereo=force_stereo)
 
 
-def geometry(ich):
+def geometry(ich, nprocs=1, timeout=None):
     """ inchi => geometry
+
+    :param nprocs: race the geometry generators in this many processes
+    :param timeout: give up on a raced generator after this many seconds
     """
-    return automol.convert.inchi.geometry(ich)
+    return automol.convert.inchi.geometry(ich, nprocs=nprocs, timeout=timeout)
 
 
 def conformers(ich, nconfs=100):
@@ -307,6 +445,26 @@ def conformers(ich, nconfs=100):
     return automol.convert.inchi.conformers(ich, nconfs)
 
 
+def batch_geometry(ichs, nprocs=None, chunksize=None):
+    """ inchis => geometries, in parallel
+
+    :returns: `(geo, seconds)` for each inchi, in order (geo is None where
+        geometry generation failed)
+    """
+    return automol.convert.inchi.batch_geometry(
+        ichs, nprocs=nprocs, chunksize=chunksize)
+
+
+def batch_conformers(ichs, nconfs=100, nprocs=None, chunksize=None):
+    """ inchis => conformers, in parallel
+
+    :returns: `(geos, seconds)` for each inchi, in order (geos is None where
+        conformer generation failed)
+    """
+    return automol.convert.inchi.batch_conformers(
+        ichs, nconfs, nprocs=nprocs, chunksize=chunksize)
+
+
 def graph(ich, no_stereo=False):
     """ inchi => graph
     """
@@ -5,7 +5,7 @@ import numpy
 import sympy.combinatorics as spc
 from automol import cart
 import automol.geom
-from automol.convert._pyx2z import to_oriented_geometry
+import automol.convert.geom
 
 
 # symmetry number codes
@@ -16,8 +16,7 @@ def external_symmetry_factor1(geo):
     if automol.geom.is_atom(geo):
         ext_sym_fac = 1.
     else:
-        oriented_geom = to_oriented_geometry(geo)
-        ext_sym_fac = oriented_geom.sym_num()
+        ext_sym_fac = automol.convert.geom.external_symmetry_number(geo)
     return ext_sym_fac
 
 
@@ -1,6 +1,8 @@
 """ test automol.automol.convert
 """
 import os
+import tempfile
+import time
 import numpy
 import automol
 
@@ -303,6 +305,244 @@ def test__geom__zmatrix_torsion_coordinate_names():
     assert set(tors_names) <= set(automol.zmatrix.dihedral_angle_names(zma))
 
 
+def test__geom__x2z_analysis():
+    """ test the shared x2z analysis of a geometry
+    """
+    geo = (('C', (-0.70116587131, 0.0146227007587, -0.016166607003)),
+           ('O', (1.7323365056, -0.9538524899, -0.5617192010)),
+           ('H', (-0.9827048283, 0.061897979239, 2.02901783816)),
+           ('H', (-0.8787925682, 1.91673409124, -0.80019507919)),
+           ('H', (-2.12093033745, -1.21447973767, -0.87411360631)),
+           ('H', (2.9512589894, 0.17507745634, 0.22317665541)))
+    automol.convert.cache.clear()
+    x2z = automol.convert.geom.x2z_analysis(geo)
+    assert automol.convert.geom.x2z_analysis(geo) is x2z
+
+    zma = automol.geom.zmatrix(geo)
+    assert automol.zmatrix.almost_equal(
+        automol.zmatrix.standard_form(x2z.zmatrix()), zma)
+    assert (set(automol.geom.zmatrix_torsion_coordinate_names(geo)) <=
+            set(automol.zmatrix.dihedral_angle_names(zma)))
+    assert (sorted(automol.geom.zmatrix_atom_ordering(geo).values()) ==
+            list(range(6)))
+    assert automol.geom.external_symmetry_factor(geo) == 1.
+    assert automol.convert.cache.statistics()['x2z_analysis'][1] == 1
+
+    # the z-matrix text is split directly, without regexes
+    syms, key_mat, name_mat, val_dct = (
+        automol.convert._pyx2z._split_zmatrix_string(
+            'C\nO, 1, R1\nH, 1, R2, 2, A2\n\nR1 = 2.7\nR2 = 2.1\n'
+            'A2 = 109.5\n'))
+    assert syms == ('C', 'O', 'H')
+    assert key_mat == ((None, None, None), (1, None, None), (1, 2, None))
+    assert name_mat == ((None, None, None), ('R1', None, None),
+                        ('R2', 'A2', None))
+    assert val_dct == {'R1': 2.7, 'R2': 2.1, 'A2': 109.5}
+
+
+def test__cache():
+    """ test the process-wide conversion cache
+    """
+    cache = automol.convert.cache
+    cache.clear()
+
+    ich = 'InChI=1S/C2H6O/c1-2-3/h3H,2H2,1H3'
+    gra1 = automol.inchi.graph(ich)
+    gra2 = automol.inchi.graph(ich, no_stereo=False)
+    assert gra1 == gra2 and gra1 is not gra2
+    assert cache.statistics()['inchi_graph'] == (1, 1)
+
+    # generating the geometry checks it with a geometry => inchi conversion
+    geo = automol.inchi.geometry(ich)
+    assert automol.inchi.geometry(ich) == geo
+    hits, misses = cache.statistics()['geom_inchi']
+    assert automol.geom.inchi(geo) == ich
+    assert automol.geom.inchi(automol.geom.compact(geo)) == ich
+    assert automol.graph.inchi(gra1) == ich
+    stats = cache.statistics()
+    assert stats['inchi_geometry'] == (1, 1)
+    assert stats['geom_inchi'] == (hits + 2, misses)
+    assert stats['graph_inchi'] == (0, 1)
+
+    # bounded size, with least recently used entries evicted first
+    cache.set_max_size(2)
+    assert cache.size() == 2
+    cache.set_max_size(cache.MAX_SIZE)
+
+    # disabling the cache leaves it untouched
+    cache.disable()
+    assert automol.geom.inchi(automol.inchi.geometry(ich)) == ich
+    assert cache.statistics()['inchi_geometry'] == (1, 1)
+    cache.enable()
+
+    cache.clear()
+    assert cache.size() == 0 and not cache.statistics()
+
+
+def test__store():
+    """ test the persistent species store
+    """
+    store = automol.convert.store
+    ich = 'InChI=1S/C2H6O/c1-2-3/h3H,2H2,1H3'
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'species.db')
+        store.connect(path)
+        automol.convert.cache.disable()
+        geo = automol.inchi.geometry(ich)
+        smi = automol.inchi.smiles(ich)
+        fml = automol.inchi.formula(ich)
+        assert store.count() == 3
+        store.disconnect()
+
+        # a new session reads the stored representations back
+        store.connect(path)
+        assert automol.inchi.geometry(ich) == geo
+        assert automol.inchi.smiles(ich) == smi
+        assert automol.inchi.formula(ich) == fml
+        assert store.get('smiles', ich) == smi
+        assert store.count() == 3
+
+        # entries stamped with another version are stale
+        store.connect(path, version='other')
+        assert store.count() == 0
+        assert store.get('smiles', ich) is None
+        assert automol.inchi.smiles(ich) == smi
+        assert store.count() == 1
+        store.purge()
+        store.connect(path, version='other')
+        assert store.count() == 1
+        store.clear()
+        assert store.count() == 0
+
+        automol.convert.cache.enable()
+        store.disconnect()
+    assert not store.is_connected()
+
+
+def test__hardcoded_inchi():
+    """ test the hardcoded inchi lookups
+    """
+    ich = 'InChI=1S/CF/c1-2'
+    geo = automol.inchi.geometry(ich)
+    gra = automol.inchi.graph(ich)
+    assert automol.geom.inchi(geo) == ich
+    assert automol.graph.inchi(gra) == ich
+    assert automol.graph.inchi(automol.graph.explicit(gra)) == ich
+
+    # anything else misses without any comparisons
+    assert automol.convert.inchi.object_to_hardcoded_inchi_by_key(
+        'graph', automol.inchi.graph('InChI=1S/CH4/h1H4'),
+        comp=lambda *_: 1 / 0) is None
+    assert automol.convert.inchi.object_to_hardcoded_inchi_by_key(
+        'inchi', 'InChI=1S/CF/c1-2') == 'InChI=1S/CF/c1-2'
+
+    # add a species at runtime
+    ich = 'InChI=1S/Si'
+    obj_dct = {
+        'inchi': ich,
+        'geom': (('Si', (0., 0., 0.)),),
+        'graph': ({0: ('Si', 0, None)}, {}),
+        'smiles': '[Si]',
+        'formula': {'Si': 1},
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = automol.convert.store
+        store.connect(os.path.join(tmp_dir, 'species.db'))
+        try:
+            store.put('smiles', ich, '[Si+]')
+
+            # changing the table invalidates the stored conversions
+            automol.convert.inchi.add_hardcoded_inchi(ich, obj_dct)
+            assert store.count() == 0
+            assert automol.inchi.geometry(ich) == obj_dct['geom']
+            assert automol.geom.inchi(obj_dct['geom']) == ich
+            assert automol.graph.inchi(obj_dct['graph']) == ich
+            automol.convert.inchi.remove_hardcoded_inchi(ich)
+            assert store.count() == 0
+            assert automol.convert.inchi.object_from_hardcoded_inchi_by_key(
+                'geom', ich) is None
+        finally:
+            store.disconnect()
+
+
+def test__geometry__racing():
+    """ test racing the geometry generators in separate processes
+    """
+    ich = 'InChI=1S/C3H7O2/c1-3(2)5-4/h3-4H,1H2,2H3/t3-/m0/s1'
+    automol.convert.cache.disable()
+    try:
+        geo = automol.inchi.geometry(ich, nprocs=2, timeout=60.)
+        assert automol.geom.inchi(geo) == ich
+    finally:
+        automol.convert.cache.enable()
+
+    # generators that run out of time count as failures (these ones just
+    # sleep for the number of seconds passed in place of the InChI)
+    gens = automol.convert.inchi.GEOMETRY_GENERATORS
+    automol.convert.inchi.GEOMETRY_GENERATORS = ((time.sleep, {}),) * 3
+    try:
+        start = time.perf_counter()
+        assert automol.convert.inchi._race_geometry_generators(
+            10., nprocs=2, timeout=0.2) is None
+        assert time.perf_counter() - start < 10.
+    finally:
+        automol.convert.inchi.GEOMETRY_GENERATORS = gens
+
+
+def test__batch_geometry():
+    """ test batch geometry and conformer generation
+    """
+    ref_ichs = ['InChI=1S/CF/c1-2'] + list(ICHS_WITH_STEREO[:3])
+
+    automol.convert.cache.clear()
+    rets = list(automol.inchi.batch_geometry(ref_ichs, nprocs=2))
+    assert len(rets) == len(ref_ichs)
+    for ref_ich, (geo, dur) in zip(ref_ichs, rets):
+        assert automol.geom.inchi(geo) == ref_ich
+        assert dur >= 0.
+    # the results are cached in this process too
+    assert automol.inchi.geometry(ref_ichs[-1]) == rets[-1][0]
+
+    rets = list(automol.inchi.batch_conformers(ref_ichs[1:], nconfs=2,
+                                               nprocs=1))
+    for ref_ich, (geos, _) in zip(ref_ichs[1:], rets):
+        assert any(automol.geom.inchi(geo) == ref_ich for geo in geos)
+
+    # a bad species gives None without stopping the batch
+    rets = list(automol.inchi.batch_geometry(
+        ['not an inchi'] + ref_ichs[:1], nprocs=1))
+    assert rets[0][0] is None
+    assert automol.geom.inchi(rets[1][0]) == ref_ichs[0]
+
+    try:
+        list(automol.inchi.batch_geometry(ref_ichs, nprocs=0))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError
+
+
+def test__graph__inchi_direct_rdkit():
+    """ test that the direct RDKit molecule and the molfile path agree
+    """
+    for ich in ICHS_NO_STEREO[:5]:
+        gra = automol.graph.without_stereo_parities(automol.inchi.graph(ich))
+        ret = automol.convert.graph.inchi_with_sort_from_geometry(gra)
+        assert ret == automol.convert.graph.inchi_with_sort_from_geometry(
+            gra, molfile=True)
+        assert ret[0] == ich
+
+    for ich in ICHS_WITH_STEREO[:5]:
+        geo = automol.inchi.geometry(ich)
+        gra = automol.convert.geom.connectivity_graph(geo)
+        idx_dct = dict(enumerate(range(automol.geom.count(geo))))
+        assert (automol.convert.graph.inchi_with_sort_from_geometry(
+            gra, geo=geo, geo_idx_dct=idx_dct) ==
+                automol.convert.graph.inchi_with_sort_from_geometry(
+                    gra, geo=geo, geo_idx_dct=idx_dct, molfile=True))
+
+
 if __name__ == '__main__':
     # test__geom__graph()
     # test__geom__inchi()
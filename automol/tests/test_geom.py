@@ -1,5 +1,10 @@
 """ test automol.geom
 """
+import io
+import os
+import pickle
+import tempfile
+import itertools
 import numpy
 import automol
 from automol import geom
@@ -21,6 +26,33 @@ def test__from_data():
     )
 
 
+def test__compact():
+    """ test geom.compact
+    """
+    geo = geom.compact(C2H2CLF_GEO)
+    assert geo == C2H2CLF_GEO and C2H2CLF_GEO == geo
+    assert hash(geo) == hash(C2H2CLF_GEO)
+    assert tuple(geo) == C2H2CLF_GEO
+    assert geo[3] == C2H2CLF_GEO[3]
+    assert geo[1:4] == C2H2CLF_GEO[1:4]
+    assert geom.is_valid(geo)
+    assert pickle.loads(pickle.dumps(geo)) == geo
+
+    assert geom.symbols(geo) == geom.symbols(C2H2CLF_GEO)
+    assert geom.coordinates(geo) == geom.coordinates(C2H2CLF_GEO)
+    assert (geom.symbols(geo, idxs=[5, 1, 1, 9]) ==
+            geom.symbols(C2H2CLF_GEO, idxs=[5, 1, 1, 9]) == ('C', 'H'))
+    assert (geom.coordinates(geo, idxs=[5, 1]) ==
+            geom.coordinates(C2H2CLF_GEO, idxs=[5, 1]))
+    assert geom.from_subset(geo, [4, 0]) == geom.from_subset(
+        C2H2CLF_GEO, [4, 0])
+    assert tuple(geo.numbers) == (9, 6, 6, 17, 1, 1)
+
+    assert geom.formula(geo) == geom.formula(C2H2CLF_GEO)
+    assert numpy.allclose(geom.coulomb_spectrum(geo),
+                          geom.coulomb_spectrum(C2H2CLF_GEO))
+
+
 def test__is_valid():
     """ test geom.is_valid
     """
@@ -48,6 +80,31 @@ def test__from_string():
         geom.from_string(geom.string(C2H2CLF_GEO)), C2H2CLF_GEO)
 
 
+def test__from_strings():
+    """ test geom.from_strings
+    """
+    geo_str = """
+C    0.000000   0.000000   0.000000
+O    0.000000   0.000000   1.228500
+H   -0.944960   0.000000  -0.545573
+H    0.944960   0.000000  -0.545573
+"""
+    geo = geom.from_string(geo_str)
+    assert geom.symbols(geo) == ('C', 'O', 'H', 'H')
+    assert numpy.allclose(geom.coordinates(geo, angstrom=True)[1],
+                          (0., 0., 1.2285))
+
+    # these fall back on the autoread parser
+    log_str = 'Input orientation:\n' + geo_str + '\n Optimized:\n' + geo_str
+    assert geom.almost_equal(geom.from_string(log_str), geo)
+
+    geos = geom.from_strings([geo_str, log_str, geo_str])
+    assert len(geos) == 3 and all(geom.almost_equal(g, geo) for g in geos)
+    geos = geom.from_strings([geo_str, geo_str], angstrom=False)
+    assert all(geom.almost_equal(g, geom.from_string(geo_str, angstrom=False))
+               for g in geos)
+
+
 def test__from_xyz_string():
     """ test geom.from_xyz_string
     """
@@ -113,6 +170,31 @@ def test__argunique_coulomb_spectrum():
     assert idxs == ref_idxs
 
 
+def test__coulomb_spectrum_index():
+    """ test geom.CoulombSpectrumIndex against pairwise comparison
+    """
+    geos = [geom.set_coordinates(
+        C2H2CLF_GEO, {5: (numpy.random.rand(3) - 0.5) * 0.05 +
+                      geom.coordinates(C2H2CLF_GEO)[5]})
+            for _ in range(40)]
+
+    ref_idxs = []
+    for idx, geo in enumerate(geos):
+        if not any(geom.almost_equal_coulomb_spectrum(geo, geos[ref_idx],
+                                                      rtol=1e-4)
+                   for ref_idx in ref_idxs):
+            ref_idxs.append(idx)
+
+    idx_ = geom.CoulombSpectrumIndex(rtol=1e-4)
+    idxs = [idx for idx, geo in enumerate(geos) if idx_.add(geo)]
+    assert idxs == ref_idxs
+    assert len(idx_) == len(ref_idxs)
+    assert all(geo in idx_ for geo in geos)
+    assert tuple(idxs) == geom.argunique_coulomb_spectrum(geos, rtol=1e-4)
+    assert not geom.argunique_coulomb_spectrum(geos, seen_geos=geos[:1],
+                                               rtol=0.5)
+
+
 def test__mass_centered():
     """ test geom.mass_centered()
     """
@@ -191,6 +273,135 @@ def test__reflect_coordinates():
     assert geo3 == ref_geo3
 
 
+def test__distance_matrix():
+    """ test geom.distance_matrix, almost_equal_dist_matrix, minimum_distance
+    """
+    natms = geom.count(C2H2CLF_GEO)
+    ref_dist_mat = [[geom.distance(C2H2CLF_GEO, idx1, idx2)
+                     for idx2 in range(natms)] for idx1 in range(natms)]
+    assert numpy.allclose(geom.distance_matrix(C2H2CLF_GEO), ref_dist_mat)
+    assert numpy.allclose(
+        geom.distance_matrix(geom.compact(C2H2CLF_GEO), block_size=4),
+        ref_dist_mat)
+
+    geo = geom.rotate(C2H2CLF_GEO, (1., 2., 3.), 0.5)
+    assert geom.almost_equal_dist_matrix(geo, C2H2CLF_GEO, thresh=1e-6)
+    geo = geom.set_coordinates(geo, {5: (0., 0., 0.)})
+    assert not geom.almost_equal_dist_matrix(geo, C2H2CLF_GEO, block_size=1)
+
+    geo = geom.translate(C2H2CLF_GEO, (10., 0., 0.))
+    ref_min_dist = min(
+        numpy.linalg.norm(numpy.subtract(xyz1, xyz2))
+        for xyz1 in geom.coordinates(C2H2CLF_GEO)
+        for xyz2 in geom.coordinates(geo))
+    assert numpy.isclose(geom.minimum_distance(C2H2CLF_GEO, geo),
+                         ref_min_dist)
+    assert numpy.isclose(
+        geom.minimum_distance(C2H2CLF_GEO, geo, block_size=2), ref_min_dist)
+
+
+def test__distance_matrix__blocks():
+    """ test the blocked distance kernels on a mid-sized geometry
+    """
+    natms = 300
+    xyzs = numpy.random.rand(natms, 3) * natms ** (1./3.) * 3.
+    geo = geom.from_data(['C'] * natms, xyzs, as_array=True)
+    geo2 = geom.translate(geo, (1., 1., 1.))
+
+    dmat = geom.distance_matrix(geo)
+    assert numpy.allclose(dmat, geom.distance_matrix(geo, block_size=128))
+
+    xyzs1 = numpy.array(geom.coordinates(geo))
+    xyzs2 = numpy.array(geom.coordinates(geo2))
+    ref_min_dist = numpy.linalg.norm(
+        xyzs1[:, None, :] - xyzs2[None, :, :], axis=-1).min()
+    assert numpy.isclose(geom.minimum_distance(geo, geo2), ref_min_dist)
+    assert numpy.isclose(geom.minimum_distance(geo, geo2, block_size=128),
+                         ref_min_dist)
+
+
+def test__ensemble():
+    """ test geom.ensemble and the ensemble property functions
+    """
+    geos = [geom.rotate(C2H2CLF_GEO, numpy.random.rand(3), numpy.random.rand())
+            for _ in range(5)]
+    geos = [geom.set_coordinates(geo, {5: numpy.random.rand(3)})
+            for geo in geos]
+    ens = geom.ensemble(geos)
+    assert len(ens) == 5
+    assert ens.coordinates.shape == (5, 6, 3)
+    assert ens[2] == geos[2]
+    assert len(ens[1:3]) == 2
+    assert pickle.loads(pickle.dumps(ens))[4] == geos[4]
+
+    assert numpy.allclose(geom.ensemble_distance_matrices(ens),
+                          [geom.distance_matrix(geo) for geo in geos])
+    assert numpy.allclose(geom.ensemble_coulomb_spectra(ens),
+                          [geom.coulomb_spectrum(geo) for geo in geos])
+    assert numpy.allclose(geom.ensemble_center_of_mass(ens),
+                          [geom.center_of_mass(geo) for geo in geos])
+    assert numpy.allclose(geom.ensemble_inertia_tensors(ens, amu=False),
+                          [geom.inertia_tensor(geo, amu=False)
+                           for geo in geos])
+    assert numpy.allclose(geom.ensemble_rotational_constants(ens),
+                          [geom.rotational_constants(geo) for geo in geos])
+    assert numpy.allclose(geom.ensemble_dihedral_angles(ens, 0, 1, 2, 5),
+                          [geom.dihedral_angle(geo, 0, 1, 2, 5)
+                           for geo in geos])
+    assert numpy.allclose(
+        geom.ensemble_dihedral_angles(ens, 5, 2, 1, 0, degree=True),
+        [geom.dihedral_angle(geo, 5, 2, 1, 0, degree=True) for geo in geos])
+
+
+def test__connectivity_graph():
+    """ test geom.connectivity_graph against a check of every atom pair
+    """
+
+    def _reference_bond_keys(geo, rqq_bond_max=3.5, rqh_bond_max=2.6):
+        syms = geom.symbols(geo)
+        bnd_keys = set()
+        for idx1, idx2 in itertools.combinations(range(len(syms)), 2):
+            pair_syms = (syms[idx1], syms[idx2])
+            dist = geom.distance(geo, idx1, idx2)
+            if 'X' not in pair_syms and dist < (
+                    rqh_bond_max if 'H' in pair_syms else rqq_bond_max):
+                bnd_keys.add(frozenset({idx1, idx2}))
+        return bnd_keys
+
+    gra = geom.connectivity_graph(C2H2CLF_GEO)
+    assert automol.graph.bond_keys(gra) == _reference_bond_keys(C2H2CLF_GEO)
+
+    # a large random system, to go through the cell lists
+    natms = 600
+    syms = numpy.random.choice(['C', 'O', 'H', 'H', 'X'], natms)
+    xyzs = numpy.random.rand(natms, 3) * 40.
+    geo = geom.from_data(syms, xyzs, as_array=True)
+    gra = geom.connectivity_graph(geo)
+    assert automol.graph.bond_keys(gra) == _reference_bond_keys(geo)
+    assert automol.graph.atom_symbols(gra) == dict(enumerate(syms))
+
+
+def test__connectivity_changes():
+    """ test geom.connectivity_changes
+    """
+    natms = 200
+    syms = numpy.random.choice(['C', 'O', 'H'], natms)
+    xyzs = numpy.random.rand(natms, 3) * 25.
+    geos = []
+    for _ in range(30):
+        xyzs = xyzs + (numpy.random.rand(natms, 3) - 0.5) * 0.4
+        geos.append(geom.from_data(syms, xyzs, as_array=True))
+
+    bnd_keys = automol.graph.bond_keys(geom.connectivity_graph(geos[0]))
+    tras = geom.connectivity_changes(geos)
+    for geo, tra in zip(geos, tras):
+        frm_bnd_keys = automol.graph.trans.old_formed_bond_keys(tra)
+        brk_bnd_keys = automol.graph.trans.old_broken_bond_keys(tra)
+        bnd_keys = (bnd_keys | frm_bnd_keys) - brk_bnd_keys
+        assert bnd_keys == automol.graph.bond_keys(
+            geom.connectivity_graph(geo))
+
+
 def test__external_symmetry_factor():
     """ test geom.external_symmety_factor
     """
@@ -262,6 +473,74 @@ C    0.000000   0.000000   8.000000"""
     assert ref_traj_str == traj_str
 
 
+def test__traj_stream():
+    """ test geom.read_xyz_trajectory and geom.write_xyz_trajectory
+    """
+    geos = [geom.translate(C2H2CLF_GEO, (0., 0., float(idx)))
+            for idx in range(5)]
+    comments = ['comment {}'.format(idx) for idx in range(5)]
+
+    traj_file = io.StringIO()
+    geom.write_xyz_trajectory(traj_file, iter(geos), comments=comments)
+    assert traj_file.getvalue() == geom.xyz_trajectory_string(
+        geos, comments=comments)
+
+    traj_file.seek(0)
+    frames = list(geom.read_xyz_trajectory(traj_file))
+    assert [comment for _, comment in frames] == comments
+    assert all(geom.almost_equal(geo, ref_geo, rtol=1e-5)
+               for (geo, _), ref_geo in zip(frames, geos))
+
+    # mismatched comments and truncated files are errors
+    for bad_comments in (comments[:3], comments + ['extra']):
+        try:
+            geom.write_xyz_trajectory(io.StringIO(), geos,
+                                      comments=bad_comments)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+
+    traj_str = geom.xyz_trajectory_string(geos[:1], comments=comments[:1])
+    for cut_str in (traj_str.splitlines()[0],
+                    '\n'.join(traj_str.splitlines()[:3])):
+        try:
+            list(geom.read_xyz_trajectory(io.StringIO(cut_str)))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError
+
+
+def test__binary_traj():
+    """ test geom.write_binary_trajectory and geom.open_binary_trajectory
+    """
+    geos = [geom.translate(C2H2CLF_GEO, (0., 0., float(idx)))
+            for idx in range(5)]
+    comments = ['comment {}'.format(idx) for idx in range(5)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, 'traj.bin')
+        geom.write_binary_trajectory(file_name, iter(geos), comments=comments)
+        traj = geom.open_binary_trajectory(file_name)
+        assert len(traj) == 5
+        assert traj.comments == tuple(comments)
+        assert traj[3] == geos[3]
+        assert list(traj) == geos
+        assert numpy.allclose(geom.ensemble_center_of_mass(traj[1:4]),
+                              [geom.center_of_mass(geo) for geo in geos[1:4]])
+        del traj
+
+        geom.write_binary_trajectory(file_name, [])
+        assert len(geom.open_binary_trajectory(file_name)) == 0
+
+        # a missing comment is an empty one
+        geom.write_binary_trajectory(file_name, geos[:2],
+                                     comments=[None, 'comment'])
+        assert geom.open_binary_trajectory(file_name).comments == (
+            '', 'comment')
+
+
 if __name__ == '__main__':
     # test__from_data()
     # test__is_valid()
@@ -1,10 +1,19 @@
 """ test automol.graph
 """
 
+import os
+import hashlib
+import itertools
+import pickle
 import numpy
 import automol
 from automol import graph
 
+PATH = os.path.dirname(os.path.realpath(__file__))
+DATA_PATH = os.path.join(PATH, 'data')
+ICHS_WITH_STEREO = numpy.loadtxt(
+    os.path.join(DATA_PATH, 'heptane_inchis_with_stereo.txt'), dtype=str)
+
 
 C8H13O_CGR = (
     {0: ('C', 3, None), 1: ('C', 2, None), 2: ('C', 3, None),
@@ -287,6 +296,40 @@ def test__from_data():
     assert sgr == C8H13O_SGR
 
 
+def test__immutable():
+    """ test graph.immutable
+    """
+    gra = graph.immutable(C8H13O_SGR)
+    assert gra == C8H13O_SGR and C8H13O_SGR == gra
+    assert graph.immutable(gra) is gra
+    assert hash(gra) == hash(graph.immutable(C8H13O_SGR))
+    assert pickle.loads(pickle.dumps(gra)) == gra
+    try:
+        graph.atoms(gra)[0] = ('O', 0, None)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError
+
+    # derived properties are computed once and shared
+    ste_keys = graph.stereogenic_atom_keys(gra)
+    assert ste_keys == graph.stereogenic_atom_keys(C8H13O_SGR)
+    nprops = gra.cache_size()
+    assert graph.stereogenic_atom_keys(gra) == ste_keys
+    assert gra.cache_size() == nprops
+    assert isinstance(graph.explicit(gra), graph.Graph)
+    assert graph.explicit(gra) is graph.explicit(gra)
+    assert graph.explicit(gra) == graph.explicit(C8H13O_SGR)
+
+    # callers can't change a cached result through their copy of it
+    @automol.graph._graph_base.memoized()
+    def _atom_key_set(gra):
+        return set(graph.atom_keys(gra))
+
+    _atom_key_set(gra).add(-1)
+    assert _atom_key_set(gra) == set(graph.atom_keys(gra))
+
+
 def test__set_atom_implicit_hydrogen_valences():
     """ test graph.set_atom_implicit_hydrogen_valences
     """
@@ -402,6 +445,33 @@ def test__bond_neighbor_keys():
     }
 
 
+def test__adjacency():
+    """ test graph.adjacency
+    """
+    adj = graph.adjacency(C8H13O_CGR)
+    assert graph.adjacency(C8H13O_RGR) is adj
+
+    # compare against literal neighbors and a brute-force scan of the bonds
+    assert dict(adj.atom_neighbor_keys) == {
+        0: {3}, 1: {4}, 2: {6}, 3: {0, 5}, 4: {1, 6}, 5: {3, 7},
+        6: {2, 4, 7}, 7: {5, 6, 8}, 8: {7}}
+
+    bnd_keys = graph.bond_keys(C8H13O_CGR)
+    for atm_key in graph.atom_keys(C8H13O_CGR):
+        assert adj.atom_bond_keys[atm_key] == {
+            bnd_key for bnd_key in bnd_keys if atm_key in bnd_key}
+
+    for bnd_key in bnd_keys:
+        assert adj.bond_neighbor_keys[bnd_key] == {
+            bnd_key_ for bnd_key_ in bnd_keys
+            if bnd_key_ != bnd_key and bnd_key_ & bnd_key}
+
+    # isolated atoms have no neighbors
+    gra = graph.add_atoms(C8H13O_CGR, {9: 'O'})
+    assert graph.atom_neighbor_keys(gra)[9] == frozenset()
+    assert graph.atom_neighborhoods(gra)[9] == ({}, {})
+
+
 # # other properties
 def test__branch():
     """ test graph.branch
@@ -557,6 +627,93 @@ def test__backbone_unique():
     assert graph.backbone_unique(C3H3_RGRS) == C3H3_RGRS[:2]
 
 
+def test__full_hash():
+    """ test graph.full_hash and graph.backbone_hash
+    """
+    # isomorphic graphs share a hash
+    for rgr in C3H3_RGRS[1:]:
+        assert graph.full_hash(rgr) == graph.full_hash(C3H3_RGRS[1])
+    assert graph.full_hash(C3H3_RGRS[0]) != graph.full_hash(C3H3_RGRS[1])
+
+    natms = len(graph.atoms(C8H13O_SGR))
+    for _ in range(5):
+        pmt_dct = dict(enumerate(numpy.random.permutation(natms)))
+        sgr_pmt = graph.relabel(C8H13O_SGR, pmt_dct)
+        assert graph.full_hash(sgr_pmt) == graph.full_hash(C8H13O_SGR)
+        assert (graph.backbone_hash(graph.explicit(sgr_pmt)) ==
+                graph.backbone_hash(C8H13O_SGR))
+
+    # uniqueness filtering only compares graphs within a hash bucket
+    rgrs = C3H3_RGRS * 50
+    assert graph.backbone_unique(rgrs) == C3H3_RGRS[:2]
+
+
+def test__isomorphism_backends():
+    """ test that the igraph and networkx backends agree
+    """
+    sgrs = [graph.explicit(sgr) for sgr in
+            (C8H13O_SGR, C2H2CL2F2_SGRS[1], C3H3CL2F3_SGRS[0],
+             C3H5N3_SGRS[0])]
+    sgr_pmts = []
+    for sgr in sgrs:
+        atm_keys = sorted(graph.atom_keys(sgr))
+        pmt_dct = dict(zip(atm_keys, numpy.random.permutation(atm_keys)))
+        sgr_pmts.append(graph.relabel(sgr, pmt_dct))
+    sub_sgrs = [graph.subgraph(sgr, graph.backbone_keys(sgr)) for sgr in sgrs]
+
+    def _results():
+        iso_dcts = list(map(graph.full_isomorphism, sgrs, sgr_pmts))
+        for sgr, sgr_pmt, iso_dct in zip(sgrs, sgr_pmts, iso_dcts):
+            assert graph.relabel(sgr, iso_dct) == sgr_pmt
+
+        has_sub_isos = [
+            graph.full_subgraph_isomorphism(sgr, sub_sgr) is not None
+            for sgr, sub_sgr in zip(sgrs, sub_sgrs)]
+        # a subgraph can't contain an extra atom
+        has_sub_isos.append(
+            graph.full_subgraph_isomorphism(sub_sgrs[0], sgrs[0]) is not None)
+
+        auts = [sorted(sorted(aut.items()) for aut in graph.automorphisms(sgr))
+                for sgr in sgrs]
+        return has_sub_isos, auts
+
+    orig_backend = graph.isomorphism_backend()
+    try:
+        rets = []
+        for backend in graph.ISOMORPHISM_BACKENDS:
+            graph.set_isomorphism_backend(backend)
+            rets.append(_results())
+    finally:
+        graph.set_isomorphism_backend(orig_backend)
+
+    (has_sub_isos, auts), other_rets = rets[0], rets[1:]
+    assert has_sub_isos == [True] * len(sgrs) + [False]
+    assert all(ret == (has_sub_isos, auts) for ret in other_rets)
+
+
+def test__canonical_string():
+    """ test graph.canonical_string and graph.canonical_hash
+    """
+    ichs = ICHS_WITH_STEREO[:100]
+    sgrs = list(map(automol.inchi.graph, ichs))
+
+    can_strs = list(map(graph.canonical_string, sgrs))
+    assert len(set(can_strs)) == len(set(ichs))
+
+    for sgr, can_str in zip(sgrs, can_strs):
+        atm_keys = sorted(graph.atom_keys(sgr))
+        pmt_dct = dict(zip(atm_keys, numpy.random.permutation(atm_keys)))
+        sgr_pmt = graph.relabel(sgr, pmt_dct)
+        assert graph.canonical_string(sgr_pmt) == can_str
+        assert graph.canonical_string(graph.explicit(sgr_pmt)) == can_str
+        assert graph.canonical(sgr_pmt) == graph.canonical(sgr)
+
+        # the hash only depends on the string, so it is the same in every
+        # process
+        assert graph.canonical_hash(sgr_pmt) == hashlib.blake2b(
+            can_str.encode(), digest_size=16).hexdigest()
+
+
 # chemistry library
 def test__atom_element_valences():
     """ test graph.atom_element_valences
@@ -704,6 +861,34 @@ def test__dominant_resonance():
     assert graph.dominant_resonance(C3H3_CGR) == C3H3_RGRS[1]
 
 
+def test__kekule():
+    """ test graph.kekule
+    """
+    assert graph.kekule(C3H3_CGR) in C3H3_RGRS[1:]
+
+    # a C24 polyene and benzene: too many pi-bond combinations to enumerate
+    # by brute force, but only one and two dominant resonances, respectively
+    nchain = 24
+    chain_gra = (
+        {key: ('C', 2 if key in (0, nchain-1) else 1, None)
+         for key in range(nchain)},
+        {frozenset({key, key+1}): (1, None) for key in range(nchain-1)})
+    ring_gra = (
+        {key: ('C', 1, None) for key in range(6)},
+        {frozenset({key, (key+1) % 6}): (1, None) for key in range(6)})
+
+    for gra, nres in ((chain_gra, 1), (ring_gra, 2)):
+        dom_rgrs = graph.dominant_resonances(gra)
+        assert len(dom_rgrs) == nres
+        assert graph.kekule(gra) in dom_rgrs
+        assert graph.dominant_resonance(gra) == dom_rgrs[0]
+        assert graph.maximum_spin_multiplicity(dom_rgrs[0]) == 1
+
+    # the lazy enumeration can stop early
+    rgrs = itertools.islice(graph.iter_subresonances(chain_gra), 10)
+    assert len(list(rgrs)) == 10
+
+
 def test__rotational_bond_keys():
     """ test graph.rotational_bond_keys
     """
@@ -760,6 +945,42 @@ def test__stereomers():
     assert graph.stereomers(C8H13O_CGR) == C8H13O_SGRS
 
 
+def test__iter_stereomers():
+    """ test graph.iter_stereomers and graph.substereomers
+    """
+    for cgr, sgrs in ((C2H2CL2F2_CGR, C2H2CL2F2_SGRS),
+                      (C3H3CL2F3_CGR, C3H3CL2F3_SGRS),
+                      (C3H5N3_CGR, C3H5N3_SGRS),
+                      (C8H13O_CGR, C8H13O_SGRS)):
+        # the pruned stereomers are one of each non-isomorphic set
+        uniq_sgrs = tuple(graph.iter_stereomers(cgr, unique=True))
+        assert all(sgr in sgrs for sgr in uniq_sgrs)
+        assert len(uniq_sgrs) == len(graph.backbone_unique(sgrs))
+
+        # each stereomer is the only one compatible with itself
+        for sgr in sgrs:
+            assert graph.substereomers(sgr) == (sgr,)
+
+    # the two stereocenters are equivalent, so one of the mixed assignments
+    # is dropped
+    assert len(tuple(graph.iter_stereomers(C2H2CL2F2_CGR, unique=True))) == 3
+
+    # CH3-(CHF)12-OH has 2^12 stereomers; take a few
+    nste = 12
+    atm_dct = {0: ('C', 3, None), nste+1: ('O', 1, None)}
+    atm_dct.update({key: ('C', 1, None) for key in range(1, nste+1)})
+    atm_dct.update({key+nste+1: ('F', 0, None) for key in range(1, nste+1)})
+    bnd_dct = {frozenset({key, key+1}): (1, None) for key in range(nste+1)}
+    bnd_dct.update({frozenset({key, key+nste+1}): (1, None)
+                    for key in range(1, nste+1)})
+    cgr = (atm_dct, bnd_dct)
+
+    sgrs = list(itertools.islice(graph.iter_stereomers(cgr), 5))
+    assert len(sgrs) == 5
+    for sgr in sgrs:
+        assert len(graph.atom_stereo_keys(sgr)) == nste
+
+
 def test__heuristic_geometry():
     """ test graph.heuristic_geometry
     """
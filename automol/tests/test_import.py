@@ -0,0 +1,41 @@
+""" test that importing automol stays cheap
+"""
+import sys
+import subprocess
+import automol
+
+# third-party backends that shouldn't be loaded by `import automol` alone
+BACKENDS = ('rdkit', 'pybel', 'openbabel', 'igraph', 'networkx', 'sympy',
+            'pyx2z', 'qcelemental', 'yaml')
+
+
+def test__import_backends():
+    """ test that `import automol` loads no backends
+    """
+    code = '\n'.join([
+        'import sys',
+        'import automol',
+        'import automol.convert',
+        'print(" ".join(sorted(set(name.split(".")[0]',
+        '                          for name in sys.modules))))',
+    ])
+    out = subprocess.check_output([sys.executable, '-c', code], text=True)
+    assert not set(out.split()) & set(BACKENDS)
+
+
+def test__lazy_access():
+    """ test that submodules still come up on attribute access
+    """
+    assert 'par' in dir(automol)
+    assert automol.convert.cache.MAX_SIZE > 0
+    try:
+        getattr(automol, 'not_a_submodule')
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError
+
+
+if __name__ == '__main__':
+    test__import_backends()
+    test__lazy_access()
@@ -1,6 +1,7 @@
 """ test automol.inchi
 """
 import numpy
+import automol
 from automol import inchi
 
 AR_ICH = 'InChI=1S/Ar'
@@ -147,6 +148,62 @@ def test__recalculate():
             == C2H2F2_ICH_STEREO_UNKNOWN)
 
 
+def test__parse():
+    """ test inchi.parse
+    """
+    pich = inchi.parse(C2H6O_ICH)
+    assert inchi.parse(C2H6O_ICH) is pich
+    assert inchi.parse(pich) is pich
+    assert str(pich) == pich.string == C2H6O_ICH
+    assert pich.formula_sublayer == 'C2H6O'
+    assert dict(pich.main_sublayers) == {'c': '1-2-3', 'h': '3H,2H2,1H3'}
+    assert dict(pich.isotope_sublayers) == {
+        'i': '2D', 't': '2-', 'm': '1', 's': '1'}
+    assert pich.has_stereo
+    assert not inchi.parse(C2H6O_ICH_NO_STEREO).has_stereo
+    assert pich.split() is pich.split() == inchi.split(C2H6O_ICH)
+
+    # the sublayers are read-only
+    try:
+        pich.main_sublayers['c'] = ''
+    except TypeError:
+        pass
+    else:
+        raise AssertionError
+
+    # the getters return copies that are safe to change
+    main_dct = inchi.main_sublayers(C2H6O_ICH)
+    main_dct['c'] = ''
+    assert inchi.main_sublayers(C2H6O_ICH) == {'c': '1-2-3', 'h': '3H,2H2,1H3'}
+
+
+def test__standard_form__without_rdkit():
+    """ test that standard forms are only recalculated when needed
+    """
+    cache = automol.convert.cache
+    cache.clear()
+
+    ich = inchi.standard_form(C8H13O_ICH)
+    assert ich == C8H13O_ICH
+    assert cache.statistics()['inchi_recalculate'] == (0, 1)
+
+    # the result came out of RDKit, so it is recognized as standard from its
+    # layers alone, without another recalculation
+    assert inchi.standard_form(ich) == ich
+    assert inchi.same_connectivity(ich, C8H13O_ICH)
+    assert inchi.standard_form(C8H13O_ICH, remove_stereo=True) == (
+        C8H13O_ICH_NO_STEREO)
+    assert cache.statistics()['inchi_recalculate'] == (0, 2)
+
+    # without the cache, everything goes through RDKit, so invalid inchis
+    # are still caught
+    cache.disable()
+    try:
+        assert inchi.standard_form(ich) == ich
+    finally:
+        cache.enable()
+
+
 if __name__ == '__main__':
     # test__from_data()
     # test__version()